@@ -1,13 +1,14 @@
 """
 Claude Router shared constants
 """
+import sys
 
-# Claude Code supported tools
-SUPPORTED_CLAUDE_TOOLS = {
+# Claude Code supported tools (immutable, interned names)
+SUPPORTED_CLAUDE_TOOLS = frozenset(sys.intern(name) for name in (
     'Write', 'Read', 'Edit', 'MultiEdit', 'Bash', 'Glob', 'Grep', 'LS', 
     'TodoWrite', 'Task', 'WebFetch', 'WebSearch', 'NotebookEdit', 'BashOutput', 
     'KillBash', 'ExitPlanMode', 'mcp__ide__getDiagnostics', 'mcp__ide__executeCode'
-}
+))
 
 # Default configuration values
 DEFAULT_MODEL_NAME = "gpt-oss:20b"
@@ -17,8 +17,8 @@ def print_dataclass_values(cls):
         original_init(self, *args, **kwargs)
         
         # 2. 초기화 직후, 인스턴스의 값들을 출력
-        # dataclasses.asdict를 사용하면 깔끔한 딕셔너리로 변환 가능
-        print(dataclasses.asdict(self))
+        # asdict는 중첩 데이터클래스까지 깊은 복사하므로 필드 값만 얕게 출력
+        print({f.name: getattr(self, f.name) for f in dataclasses.fields(self)})
 
     # 클래스의 __init__ 메서드를 우리가 만든 래퍼 함수로 교체
     cls.__init__ = wrapper_init
@@ -7,23 +7,24 @@ Supports:
 - Streaming response (SSE)
 - Compatible with Docker + uvicorn --reload
 """
-from dataclasses import dataclass, field
-from enum import Enum
+from contextlib import asynccontextmanager
+import functools
+import logging
 import os
 import json
-from typing import Any, Optional
 import yaml
-import requests
-import re
-import subprocess
-from pathlib import Path
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+import httpx
 import sys
 from fastapi import FastAPI, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 
-# src 폴더에 있는 type.py와 util.py를 임포트합니다.
+# src 폴더에 있는 type 패키지와 util.py를 임포트합니다.
 from src.type import *
-from src.util import add_tool_instruction, build_message_start, convert_claude_tools_to_ollama, generate_signature, to_sse, convert_ollama_tool_call_to_claude, dict_to_ollama_tool_call
+from src.util import add_tool_instruction, build_message_start, convert_claude_tools_to_ollama, make_signer, finish_signature, generate_signature, to_sse, convert_messages_to_ollama_format, convert_ollama_tool_call_to_claude, dict_to_ollama_tool_call, aiter_ndjson_lines, json_dumps, json_loads
 
 # Ensure stdout/stderr can handle Unicode output (e.g. emojis) on Windows
 for stream in (sys.stdout, sys.stderr):
@@ -32,16 +33,36 @@ for stream in (sys.stdout, sys.stderr):
     except Exception:
         pass
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 종료 시 Ollama 커넥션 풀 정리
+    await _client.aclose()
+
+app = FastAPI(lifespan=lifespan)
+
+# 스트리밍 경로의 디버그 출력은 print 대신 로거로 보내고, 기본 레벨(INFO)에서는 포맷팅 비용도 들지 않게 한다
+logging.basicConfig(format="%(message)s")
+log = logging.getLogger("claude_router")
+log.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
 
 # -----------------------------
 # 1. 설정 로드
 # -----------------------------
-try:
-    with open('config.yaml', 'r') as f:
-        config = yaml.safe_load(f)
-except FileNotFoundError:
-    config = {}
+@functools.lru_cache(maxsize=1)
+def _load_config_cached(path, mtime_ns, size):
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=YamlLoader) or {}
+
+def load_config(path='config.yaml'):
+    """설정 파일은 한 번만 파싱하고, 파일이 바뀐 경우(mtime/size)에만 다시 읽는다"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return {}
+    return _load_config_cached(path, stat.st_mtime_ns, stat.st_size)
+
+config = load_config('config.yaml')
 
 from src.const import DEFAULT_OLLAMA_URL, DEFAULT_MODEL_NAME, DEFAULT_HOST, DEFAULT_PORT
 
@@ -49,12 +70,78 @@ OLLAMA_URL = os.getenv("OLLAMA_URL", config.get('ollama_url', DEFAULT_OLLAMA_URL
 MODEL_NAME = os.getenv("MODEL_NAME", config.get('model_name', DEFAULT_MODEL_NAME))
 HOST = os.getenv("PROXY_HOST", config.get('host', DEFAULT_HOST))
 PORT = int(os.getenv("PROXY_PORT", config.get('port', DEFAULT_PORT)))
+OLLAMA_TIMEOUT = 1200.0
+
+# 모든 스트림이 하나의 이벤트 루프 위에서 커넥션 풀을 공유하도록 모듈 단위 클라이언트를 사용한다
+# (요청마다 TCP 연결을 새로 맺지 않도록 keep-alive 커넥션을 유지)
+_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(OLLAMA_TIMEOUT),
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+)
 
 print(f"🔧 Claude Router Configuration:")
 print(f"   OLLAMA_URL: {OLLAMA_URL}")
 print(f"   MODEL_NAME: {MODEL_NAME}")
 print(f"   HOST: {HOST}:{PORT}")
 
+# -----------------------------
+# 2. SSE 바이트 템플릿
+# -----------------------------
+# 토큰마다 데이터클래스를 만들고 직렬화하는 대신, 고정된 프레임의 앞/뒤를 미리 만들어 두고
+# 가변 부분(index, 텍스트)만 이어 붙인다.
+_DELTA_PREFIX = b'event: content_block_delta\ndata: {"type":"content_block_delta","index":'
+_TEXT_DELTA_MID = b',"delta":{"type":"text_delta","text":'
+_THINKING_DELTA_MID = b',"delta":{"type":"thinking_delta","thinking":'
+_DELTA_SUFFIX = b'}}\n\n'
+_BLOCK_STOP_PREFIX = b'event: content_block_stop\ndata: {"type":"content_block_stop","index":'
+_BLOCK_STOP_SUFFIX = b'}\n\n'
+# 도구 호출이 없는 일반 응답의 종료 message_delta: output_tokens만 가변
+_END_TURN_DELTA_PREFIX = (b'event: message_delta\ndata: {"type":"message_delta",'
+                          b'"delta":{"stop_reason":"end_turn","stop_sequence":null},'
+                          b'"usage":{"input_tokens":0,"output_tokens":')
+_END_TURN_DELTA_SUFFIX = b'}}\n\n'
+_BLOCK_START_PREFIX = b'event: content_block_start\ndata: {"type":"content_block_start","index":'
+_TEXT_BLOCK_START_SUFFIX = b',"content_block":{"type":"text","text":""}}\n\n'
+_THINKING_BLOCK_START_SUFFIX = b',"content_block":{"type":"thinking"}}\n\n'
+_SIGNATURE_DELTA_MID = b',"delta":{"type":"signature_delta","signature":"'
+_SIGNATURE_DELTA_SUFFIX = b'"}}\n\n'
+
+# 고정된 모양의 이벤트별 emitter: 가변 필드만 받아서 완성된 SSE 프레임을 돌려준다
+def emit_text_delta(index, text):
+    return _DELTA_PREFIX + str(index).encode() + _TEXT_DELTA_MID + json_dumps(text) + _DELTA_SUFFIX
+
+def emit_thinking_delta(index, thinking):
+    return _DELTA_PREFIX + str(index).encode() + _THINKING_DELTA_MID + json_dumps(thinking) + _DELTA_SUFFIX
+
+def emit_signature_delta(index, signature):
+    # base64 서명은 JSON 이스케이프가 필요 없는 문자만 포함한다
+    return _DELTA_PREFIX + str(index).encode() + _SIGNATURE_DELTA_MID + signature.encode() + _SIGNATURE_DELTA_SUFFIX
+
+def emit_text_block_start(index):
+    return _BLOCK_START_PREFIX + str(index).encode() + _TEXT_BLOCK_START_SUFFIX
+
+def emit_thinking_block_start(index):
+    return _BLOCK_START_PREFIX + str(index).encode() + _THINKING_BLOCK_START_SUFFIX
+
+def emit_block_stop(index):
+    return _BLOCK_STOP_PREFIX + str(index).encode() + _BLOCK_STOP_SUFFIX
+
+# to_sse에 넘기는 이벤트 이름도 매번 Enum 속성 조회를 하지 않도록 모듈 상수로 풀어 둔다
+EV_MSG_START = Event.message_start.value
+EV_START = Event.content_block_start.value
+EV_DELTA = Event.content_block_delta.value
+EV_MSG_DELTA = Event.message_delta.value
+EV_MSG_STOP = Event.message_stop.value
+EV_ERR = Event.error.value
+
+# 가변 필드가 없는 message_stop은 한 번만 직렬화하고, error는 message만 이스케이프해서 끼워 넣는다
+_MSG_STOP_SSE = to_sse(event=EV_MSG_STOP, data=MessageStop())
+_ERROR_PREFIX = b'event: ' + EV_ERR.encode() + b'\ndata: {"type":"error","error":{"type":"error","message":'
+_ERROR_SUFFIX = b'}}\n\n'
+
+def emit_error(message):
+    return _ERROR_PREFIX + json_dumps(message) + _ERROR_SUFFIX
+
 
 @app.get("/health")
 async def health():
@@ -81,134 +168,127 @@ async def clear_logs():
         return {"status": "error", "message": f"Failed to clear log file: {str(e)}"}
 
 
-def stream_from_ollama(messages, model=MODEL_NAME, tools=None, tool_choice=None):
-    payload = {"model": MODEL_NAME, "messages": messages, "stream": True}
+def build_ollama_payload(messages, tools=None, stream=True):
+    payload = {"model": MODEL_NAME, "messages": messages, "stream": stream}
 
     if tools:
         ollama_tools = convert_claude_tools_to_ollama(tools)
         if ollama_tools:
             add_tool_instruction(payload, ollama_tools, messages)
+    return payload
+
+def convert_tool_calls(tool_calls):
+    """Ollama tool_calls → ClaudeToolCall 목록 (변환에 실패한 호출은 건너뛴다)"""
+    converted = []
+    for tool_call in tool_calls:
+        log.debug("🔧 Converting Ollama tool call: %s", tool_call)
+        
+        try:
+            # Convert dict to ToolCall dataclass first, then to ClaudeToolCall
+            claude_tool_call = convert_ollama_tool_call_to_claude(dict_to_ollama_tool_call(tool_call))
+        except (ValueError, TypeError) as e:
+            log.warning("❌ Failed to convert tool call: %s. Skipping.", e)
+            continue
+
+        log.debug("  ✅ Converted to Claude format - Tool: %s, Args: %s", claude_tool_call.name, claude_tool_call.input)
+        converted.append(claude_tool_call)
+    return converted
+
+async def stream_from_ollama(messages, model=MODEL_NAME, tools=None, tool_choice=None):
+    payload = build_ollama_payload(messages, tools)
 
     try:
-        start_message = Message(model=model)
-        message_start_event = MessageStart(message=start_message)
-        yield to_sse(event=Event.message_start.value, data=message_start_event)
+        yield to_sse(event=EV_MSG_START, data=build_message_start(model))
         
-        print("start to stream")
-        print(f"🔥 Connecting to: {OLLAMA_URL}")
-        print(f"🔥 Payload: {json.dumps(payload)}")
+        log.debug("🔥 Connecting to: %s", OLLAMA_URL)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("🔥 Payload: %s", json.dumps(payload))
         
         try:
-            with requests.post(OLLAMA_URL, json=payload, stream=True, timeout=1200) as resp:
-                print("🔥 Connected! Starting stream...")
+            async with _client.stream("POST", OLLAMA_URL, json=payload) as resp:
                 resp.raise_for_status()
-                print("🔥 Response status OK")
                 
-                full_response = ""
-                thinking_text = ""
+                # 응답 전문을 누적하지 않고 공백 수로 출력 토큰을 근사한다
+                output_tokens = 0
+                has_content = False
+                thinking_signer = None
                 current_block_index = 0
                 current_block_type = ""
                 final_tool_calls = None
 
-                for line in resp.iter_lines(decode_unicode=True):
-                    if not line.strip():
-                        continue
+                async for line in aiter_ndjson_lines(resp.aiter_bytes()):
                     try:
-                        data = json.loads(line.strip())
+                        data = json_loads(line)
                         message = data.get("message", {})
                         content = message.get("content", "")
                         thinking = message.get("thinking", "")
                         tool_calls = message.get("tool_calls", [])
                         
-                        print(f"🔍 Received: done={data.get('done')}, thinking={thinking}, content='{content}', tool_calls={len(tool_calls)}")
+                        log.debug("🔍 Received: done=%s, thinking=%r, content=%r, tool_calls=%d",
+                                  data.get('done'), thinking, content, len(tool_calls))
 
                         if data.get("done", False):
-                            print(f"🔚 Stream ended, done=True detected")
                             if tool_calls:
-                                print(f"🛠️  Found {len(tool_calls)} tool calls in final message")
+                                log.debug("🛠️  Found %d tool calls in final message", len(tool_calls))
                                 final_tool_calls = tool_calls
-                            else:
-                                print("❌ No tool_calls in final message")
                             # Break to exit the streaming loop and process tool calls below
                             break
                         
                         if thinking:
-                            thinking_text += thinking
-                            if current_block_type and current_block_type != "thinking":
-                                yield to_sse(event=Event.content_block_stop.value, data=ContentBlockStop(index=current_block_index))
-                                current_block_index += 1
-                            
+                            # 블록 전환(stop + start)과 첫 delta는 하나의 프레임으로 묶어서 yield
+                            frame = b""
                             if current_block_type != "thinking":
+                                if current_block_type:
+                                    frame = emit_block_stop(current_block_index)
+                                    current_block_index += 1
                                 current_block_type = "thinking"
-                                start_event = ContentBlockThinkingStart(index=current_block_index)
-                                yield to_sse(event=Event.content_block_start.value, data=start_event)
+                                # 서명은 블록마다 그 블록의 thinking 텍스트만 대상으로, 조각이 올 때마다 이어서 해시한다
+                                thinking_signer = make_signer()
+                                frame += emit_thinking_block_start(current_block_index)
+                            thinking_signer.update(thinking.encode("utf-8"))
                             
-                            delta_event = ContentBlockThinkingDelta(index=current_block_index, delta=ContentBlockThinkingDeltaDelta(thinking=thinking))
-                            yield to_sse(event=Event.content_block_delta.value, data=delta_event)
+                            yield frame + emit_thinking_delta(current_block_index, thinking)
                             continue
 
                         if content:
-                            full_response += content
-                            if current_block_type and current_block_type != "content":
-                                signature_event = ContentBlockSignatureDelta(
-                                    index=current_block_index,
-                                    delta=ContentBlockSignatureDeltaDelta(signature=generate_signature(thinking_text))
-                                )
-                                yield to_sse(event=Event.content_block_delta.value, data=signature_event)
-                                
-                                content_block_stop = ContentBlockStop(index=current_block_index)
-                                yield to_sse(event=Event.content_block_stop.value, data=content_block_stop)
-                                current_block_index += 1
-                            
+                            output_tokens += content.count(' ')
+                            has_content = True
+                            frame = b""
                             if current_block_type != "content":
+                                if current_block_type:
+                                    frame = (emit_signature_delta(current_block_index, finish_signature(thinking_signer))
+                                             + emit_block_stop(current_block_index))
+                                    current_block_index += 1
                                 current_block_type = "content"
-                                start_event = ContentBlockStart(index=current_block_index, content_block=ContentBlock(text=""))
-                                yield to_sse(event=Event.content_block_start.value, data=start_event)
+                                frame += emit_text_block_start(current_block_index)
                             
-                            delta_event = ContentBlockDelta(index=current_block_index, delta=ContentBlockDeltaDelta(text=content))
-                            yield to_sse(event=Event.content_block_delta.value, data=delta_event)
+                            yield frame + emit_text_delta(current_block_index, content)
                             continue
 
                     except json.JSONDecodeError as e:
-                        print(f"⚠️  JSON decode error: {e}")
+                        log.warning("⚠️  JSON decode error: %s", e)
                         continue
                 
+                # 스트림 종료 시 나머지 이벤트(signature, stop, tool_use 블록, message_delta)는 한 번에 yield
+                tail = []
+                if current_block_type:
+                    if current_block_type == "thinking":
+                        tail.append(emit_signature_delta(current_block_index, finish_signature(thinking_signer)))
+
+                    tail.append(emit_block_stop(current_block_index))
+
                 if final_tool_calls:
-                    print(f"🛠️  Processing {len(final_tool_calls)} tool calls at the end of stream.")
+                    log.debug("🛠️  Processing %d tool calls at the end of stream.", len(final_tool_calls))
 
                     if current_block_type:
-                        if current_block_type == "thinking":
-                             signature_event = ContentBlockSignatureDelta(
-                                index=current_block_index,
-                                delta=ContentBlockSignatureDeltaDelta(signature=generate_signature(thinking_text))
-                            )
-                             yield to_sse(event=Event.content_block_delta.value, data=signature_event)
-
-                        print(f"🔚 Sending content_block_stop for index {current_block_index}")
-                        yield to_sse(event=Event.content_block_stop.value, data=ContentBlockStop(index=current_block_index))
                         current_block_index += 1
-                        print(f"🔄 Block index incremented to {current_block_index}")
 
-                    for tool_call in final_tool_calls:
-                        print(f"🔧 Converting Ollama tool call: {tool_call}")
-                        
-                        try:
-                            # Convert dict to ToolCall dataclass first
-                            ollama_tool_call = dict_to_ollama_tool_call(tool_call)
-                            
-                            # Convert ToolCall to ClaudeToolCall dataclass
-                            claude_tool_call = convert_ollama_tool_call_to_claude(ollama_tool_call)
-                            
-                            # Extract data from ClaudeToolCall dataclass
-                            tool_id = claude_tool_call.id
-                            tool_name = claude_tool_call.name
-                            validated_args = claude_tool_call.input
-                            
-                            print(f"  ✅ Converted to Claude format - Tool: {tool_name}, Args: {validated_args}")
-                            
-                        except (ValueError, TypeError) as e:
-                            print(f"❌ Failed to convert tool call: {e}. Skipping.")
-                            continue
+                    converted = convert_tool_calls(final_tool_calls)
+                    for claude_tool_call in converted:
+                        # Extract data from ClaudeToolCall dataclass
+                        tool_id = claude_tool_call.id
+                        tool_name = claude_tool_call.name
+                        validated_args = claude_tool_call.input
 
                         tool_use_content_block = ContentBlockToolUse(
                             type="tool_use",
@@ -217,10 +297,10 @@ def stream_from_ollama(messages, model=MODEL_NAME, tools=None, tool_choice=None)
                         )
                         
                         start_event = ContentBlockStart(index=current_block_index, content_block=tool_use_content_block)
-                        yield to_sse(event=Event.content_block_start.value, data=start_event)
+                        tail.append(to_sse(event=EV_START, data=start_event))
                         
                         if validated_args:
-                            input_json = json.dumps(validated_args, ensure_ascii=False)
+                            input_json = json_dumps(validated_args).decode()
                             delta_event = ContentBlockDelta(
                                 index=current_block_index,
                                 delta=ContentBlockToolUseDelta(
@@ -228,57 +308,90 @@ def stream_from_ollama(messages, model=MODEL_NAME, tools=None, tool_choice=None)
                                     partial_json=input_json
                                 )
                             )
-                            yield to_sse(event=Event.content_block_delta.value, data=delta_event)
+                            tail.append(to_sse(event=EV_DELTA, data=delta_event))
                         
-                        stop_event = ContentBlockStop(index=current_block_index)
-                        yield to_sse(event=Event.content_block_stop.value, data=stop_event)
+                        tail.append(emit_block_stop(current_block_index))
                         current_block_index += 1
                     
-                    usage_info = Usage(output_tokens=len(final_tool_calls) * 10)
+                    usage_info = Usage(output_tokens=len(converted) * 10)
                     delta_info = MessageDeltaDelta(stop_reason="tool_use", stop_sequence=None)
                     stop_reason_delta = MessageDelta(delta=delta_info, usage=usage_info)
-                    yield to_sse(event=Event.message_delta.value, data=stop_reason_delta)
+                    tail.append(to_sse(event=EV_MSG_DELTA, data=stop_reason_delta))
                     
                 else: 
-                    if current_block_type:
-                        if current_block_type == "thinking":
-                             signature_event = ContentBlockSignatureDelta(
-                                index=current_block_index,
-                                delta=ContentBlockSignatureDeltaDelta(signature=generate_signature(thinking_text))
-                            )
-                             yield to_sse(event=Event.content_block_delta.value, data=signature_event)
+                    if has_content:
+                        output_tokens += 1
+                    tail.append(_END_TURN_DELTA_PREFIX + str(output_tokens).encode() + _END_TURN_DELTA_SUFFIX)
 
-                        yield to_sse(event=Event.content_block_stop.value, data=ContentBlockStop(index=current_block_index))
-                    
-                    output_tokens = len(full_response.split()) if full_response else 0
-                    usage_info = Usage(output_tokens=output_tokens)
-                    message_delta = MessageDelta(usage=usage_info)
-                    yield to_sse(event=Event.message_delta.value, data=message_delta)
-
-        except requests.exceptions.Timeout as e:
-            print(f"🔥 TIMEOUT: Ollama request timed out after {resp.timeout if 'resp' in locals() else 300}s")
-            print(f"🔥 This usually means the model is thinking too long or got stuck")
-            error_event = Error(error=ErrorMessage(message=f"Request timeout: {str(e)}"))
-            yield to_sse(event=Event.error.value, data=error_event)
+                yield b"".join(tail)
+
+        except httpx.TimeoutException as e:
+            log.error("🔥 TIMEOUT: Ollama request timed out after %ss "
+                      "(the model is probably thinking too long or got stuck)", OLLAMA_TIMEOUT)
+            yield emit_error(f"Request timeout: {str(e)}")
             return
-        except requests.exceptions.RequestException as e:
-            print(f"🔥 Connection failed: {e}")
-            error_event = Error(error=ErrorMessage(message=str(e)))
-            yield to_sse(event=Event.error.value, data=error_event)
+        except httpx.HTTPError as e:
+            log.error("🔥 Connection failed: %s", e)
+            yield emit_error(str(e))
             return
 
-        message_stop = MessageStop()
-        yield to_sse(event=Event.message_stop.value, data=message_stop)
+        yield _MSG_STOP_SSE
     
     except Exception as e:
-        print(f"🔥 Unexpected error: {e}")
-        error_event = Error(error=ErrorMessage(message=str(e)))
-        yield to_sse(event=Event.error.value, data=error_event)
+        log.exception("🔥 Unexpected error: %s", e)
+        yield emit_error(str(e))
+
+def _json_response(data, status_code=200):
+    return Response(content=json_dumps(data), status_code=status_code, media_type="application/json")
+
+async def complete_from_ollama(messages, model=MODEL_NAME, tools=None, tool_choice=None):
+    """stream=false 요청: Ollama 응답을 한 번에 받아 Anthropic Messages 응답 하나로 돌려준다"""
+    payload = build_ollama_payload(messages, tools, stream=False)
+
+    try:
+        resp = await _client.post(OLLAMA_URL, json=payload)
+        resp.raise_for_status()
+        data = json_loads(resp.content)
+    except httpx.TimeoutException as e:
+        log.error("🔥 TIMEOUT: Ollama request timed out after %ss", OLLAMA_TIMEOUT)
+        return _json_response(Error(error=ErrorMessage(message=f"Request timeout: {str(e)}")), 504)
+    except httpx.HTTPError as e:
+        log.error("🔥 Connection failed: %s", e)
+        return _json_response(Error(error=ErrorMessage(message=str(e))), 502)
+    except ValueError as e:
+        # 잘렸거나 JSON이 아닌 Ollama 응답
+        log.warning("⚠️  JSON decode error: %s", e)
+        return _json_response(Error(error=ErrorMessage(message=f"Invalid response from Ollama: {e}")), 502)
+
+    message = data.get("message", {})
+    thinking = message.get("thinking", "")
+    content = message.get("content", "")
+
+    # 스트리밍 경로와 같은 순서(thinking → text → tool_use)로 블록을 만든다
+    blocks = []
+    if thinking:
+        blocks.append({"type": "thinking", "thinking": thinking, "signature": generate_signature(thinking)})
+    if content:
+        blocks.append({"type": "text", "text": content})
+    converted = convert_tool_calls(message.get("tool_calls") or [])
+    for claude_tool_call in converted:
+        blocks.append(ContentBlockToolUse(id=claude_tool_call.id, name=claude_tool_call.name, input=claude_tool_call.input))
+
+    result = build_message_start(model).message
+    result.content = blocks
+    if converted:
+        result.stop_reason = "tool_use"
+        result.usage = Usage(output_tokens=len(converted) * 10)
+    else:
+        result.stop_reason = "end_turn"
+        result.usage = Usage(output_tokens=content.count(' ') + 1 if content else 0)
+    return _json_response(result)
 
 @app.post("/v1/messages")
 async def messages_endpoint(request: Request):
     payload = await request.json()
-    print(f"Received payload: {json.dumps(payload)}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("Received payload: %s", json.dumps(payload))
     
     messages = payload.get("messages") or payload.get("input") or ""
     model = MODEL_NAME
@@ -287,9 +400,12 @@ async def messages_endpoint(request: Request):
     
     # Convert Anthropic messages format to Ollama format
     if messages and isinstance(messages, list):
-        from src.util import convert_messages_to_ollama_format
         messages = convert_messages_to_ollama_format(messages)
     
+    # stream을 명시적으로 false로 보낸 경우에만 단일 JSON 응답 (생략하면 기존처럼 SSE)
+    if payload.get("stream") is False:
+        return await complete_from_ollama(messages, model, tools, tool_choice)
+    
     return StreamingResponse(
         stream_from_ollama(messages, model, tools, tool_choice),
         media_type="text/event-stream",
@@ -1,4 +1,16 @@
 # Import all types from the separate modules for backward compatibility
+import os
+
 from .event import *
 from .args import *  
-from .tool import *
\ No newline at end of file
+from .tool import *
+
+# 디버그 전용: CLAUDE_ROUTER_DEBUG_DATACLASSES 가 설정된 경우에만 생성 시 값을 출력
+# (스트리밍 중 이벤트마다 stdout 쓰기가 발생하므로 기본값은 비활성화)
+if os.getenv("CLAUDE_ROUTER_DEBUG_DATACLASSES"):
+    from dataclasses import is_dataclass
+    from src.deco import print_dataclass_values
+
+    for _name, _obj in list(globals().items()):
+        if isinstance(_obj, type) and is_dataclass(_obj):
+            globals()[_name] = print_dataclass_values(_obj)
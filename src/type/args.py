@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, fields, MISSING
+from typing import List, Optional, Union
 
 # ==================================================================
 # Tool Argument Dataclasses (Based on claude_code.txt)
@@ -137,4 +137,41 @@ TOOL_ARG_CLASSES = {
     "KillBash": KillBashArgs,
     "mcp__ide__getDiagnostics": McpIdeGetDiagnosticsArgs,
     "mcp__ide__executeCode": McpIdeExecuteCodeArgs,
-}
\ No newline at end of file
+}
+
+
+# ==================================================================
+# Prebuilt validation specs
+# ==================================================================
+# 도구 호출마다 dataclasses.fields()와 Optional/List 타입 분석을 반복하지 않도록
+# 임포트 시점에 한 번만 풀어 둔다. (name, target_type, is_list) 튜플에서
+# target_type이 str/int/bool이 아니면 값을 그대로 통과시킨다.
+
+@dataclass(slots=True, frozen=True)
+class ToolArgSpec:
+    fields: tuple
+    names: frozenset
+    required: tuple
+
+def _resolve_arg_type(field_type):
+    """Optional[T] → T 로 풀고, List 타입 여부를 함께 반환"""
+    target_type = field_type
+    if getattr(field_type, '__origin__', None) is Union:
+        args = field_type.__args__
+        if type(None) in args:
+            non_none_types = [arg for arg in args if arg is not type(None)]
+            target_type = non_none_types[0] if non_none_types else str
+        else:
+            target_type = args[0]
+    return target_type, getattr(target_type, '__origin__', None) is list
+
+def build_tool_arg_spec(tool_class) -> ToolArgSpec:
+    class_fields = fields(tool_class)
+    return ToolArgSpec(
+        fields=tuple((f.name, *_resolve_arg_type(f.type)) for f in class_fields),
+        names=frozenset(f.name for f in class_fields),
+        required=tuple(f.name for f in class_fields
+                       if f.default is MISSING and f.default_factory is MISSING),
+    )
+
+TOOL_ARG_SPECS = {name: build_tool_arg_spec(cls) for name, cls in TOOL_ARG_CLASSES.items()}
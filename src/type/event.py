@@ -1,9 +1,11 @@
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Dict, Optional
-import uuid
+import secrets
 
 # Anthropic/Claude Streaming Protocol Dataclasses
+# 이벤트마다 생성되므로 slots=True, 생성 후 변경되지 않는 leaf 타입은 frozen=True
+# (frozen leaf 기본값은 default_factory 대신 공유 인스턴스를 그대로 쓴다)
 
 class Event(Enum):
     message_start = "message_start"
@@ -15,14 +17,14 @@ class Event(Enum):
     error = "error"
     ping = "ping"
 
-@dataclass
+@dataclass(slots=True)
 class Usage:
     input_tokens: int = 0
     output_tokens: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class Message:
-    id: str = field(default_factory=lambda: f"msg_{uuid.uuid4().hex[:12]}")
+    id: str = field(default_factory=lambda: f"msg_{secrets.token_hex(6)}")
     type: str = "message"
     role: str = "assistant"
     model: str = ""
@@ -31,107 +33,107 @@ class Message:
     stop_sequence: Optional[str] = None
     usage: Usage = field(default_factory=Usage)
 
-@dataclass
+@dataclass(slots=True)
 class MessageStart:
     type: str = Event.message_start.value
     message: Message = field(default_factory=Message)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContentBlock:
     type: str = "text"
     text: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlockStart:
     type: str = Event.content_block_start.value
     index: int = 0
-    content_block: ContentBlock = field(default_factory=ContentBlock)
+    content_block: ContentBlock = ContentBlock()
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContentBlockDeltaDelta:
     type: str = "text_delta"
     text: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlockDelta:
     type: str = Event.content_block_delta.value
     index: int = 0
-    delta: ContentBlockDeltaDelta = field(default_factory=ContentBlockDeltaDelta)
+    delta: ContentBlockDeltaDelta = ContentBlockDeltaDelta()
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlockStop:
     type: str = Event.content_block_stop.value
     index: int = 0
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MessageDeltaDelta:
     stop_reason: str = "end_turn"
     stop_sequence: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MessageDeltaUsage:
     output_tokens: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class MessageDelta:
     type: str = Event.message_delta.value
-    delta: MessageDeltaDelta = field(default_factory=MessageDeltaDelta)
-    usage: MessageDeltaUsage = field(default_factory=MessageDeltaUsage)
+    delta: MessageDeltaDelta = MessageDeltaDelta()
+    usage: MessageDeltaUsage = MessageDeltaUsage()
 
-@dataclass
+@dataclass(slots=True)
 class MessageStop:
     type: str = Event.message_stop.value
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ErrorMessage:
     type: str = "error"
     message: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class Error:
     type: str = "error"
-    error: ErrorMessage = field(default_factory=ErrorMessage)
+    error: ErrorMessage = ErrorMessage()
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContentBlockThinking:
     type: str = "thinking"
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlockThinkingStart:
     type: str = "content_block_start"
     index: int = 0
-    content_block: ContentBlockThinking = field(default_factory=ContentBlockThinking)
+    content_block: ContentBlockThinking = ContentBlockThinking()
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContentBlockThinkingDeltaDelta:
     type: str = "thinking_delta"
     thinking: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlockThinkingDelta:
     type: str = "content_block_delta"
     index: int = 0
-    delta: ContentBlockThinkingDeltaDelta = field(default_factory=ContentBlockThinkingDeltaDelta)
+    delta: ContentBlockThinkingDeltaDelta = ContentBlockThinkingDeltaDelta()
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContentBlockSignatureDeltaDelta:
     type: str = "signature_delta"
     signature: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlockSignatureDelta:
     type: str = "content_block_delta"
     index: int = 0
-    delta: ContentBlockSignatureDeltaDelta = field(default_factory=ContentBlockSignatureDeltaDelta)
+    delta: ContentBlockSignatureDeltaDelta = ContentBlockSignatureDeltaDelta()
 
-@dataclass
+@dataclass(slots=True)
 class ContentBlockToolUse:
     type: str = "tool_use"
     id: str = ""
     name: str = ""
     input: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ContentBlockToolUseDelta:
     type: str = "input_json_delta"
     partial_json: str = ""
\ No newline at end of file
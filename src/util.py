@@ -1,110 +1,173 @@
 import base64
-from dataclasses import asdict, dataclass, MISSING
+from dataclasses import fields, is_dataclass
+import functools
 import hashlib
 import hmac
 import json
+import logging
 import os
-import uuid
-from typing import Union
-from typing import TYPE_CHECKING
+import secrets
 
-from src.type import Message, MessageStart
+from src.const import DEFAULT_SIGNATURE_SECRET, SUPPORTED_CLAUDE_TOOLS
+from src.type import Message, MessageStart, TOOL_ARG_SPECS
+from src.type.tool import ClaudeToolCall, ToolCall, ToolFunctionCall
 
-if TYPE_CHECKING:
-    from src.type.tool import ToolCall, ClaudeToolCall
+# main의 "claude_router" 로거 하위로 두어 LOG_LEVEL 설정을 그대로 따른다
+log = logging.getLogger("claude_router.util")
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+if orjson is not None:
+    def json_dumps(obj) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes (dataclasses are handled natively)"""
+        return orjson.dumps(obj)
+
+    json_loads = orjson.loads
+else:
+    # asdict()는 모든 필드를 재귀적으로 deepcopy하므로, 클래스별로 얕은 dict 변환 함수를 만들어 둔다.
+    # 중첩된 dataclass는 인코더가 default 훅으로 다시 넘겨준다.
+    _ASDICT_CACHE = {}
+
+    def _build_to_dict(cls):
+        # 필드 접근을 그대로 풀어 쓴 함수를 생성한다: def _td_Usage(o): return {'input_tokens': o.input_tokens, ...}
+        func_name = f"_td_{cls.__name__}"
+        body = ", ".join(f"{f.name!r}: o.{f.name}" for f in fields(cls))
+        namespace = {}
+        exec(f"def {func_name}(o):\n    return {{{body}}}\n", namespace)
+        to_dict = _ASDICT_CACHE[cls] = namespace[func_name]
+        return to_dict
+
+    def _to_dict(obj):
+        cls = type(obj)
+        to_dict = _ASDICT_CACHE.get(cls)
+        if to_dict is None:
+            if not is_dataclass(cls):
+                raise TypeError(f"Object of type {cls.__name__} is not JSON serializable")
+            to_dict = _build_to_dict(cls)
+        return to_dict(obj)
+
+    _json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=_to_dict)
+
+    def json_dumps(obj) -> bytes:
+        """Serialize to compact UTF-8 JSON bytes"""
+        return _json_encoder.encode(obj).encode("utf-8")
+
+    json_loads = json.loads
+
+    # 스트리밍에서 쓰는 src.type의 dataclass들은 임포트 시점에 미리 생성
+    import src.type as _types
+    for _cls in vars(_types).values():
+        if isinstance(_cls, type) and is_dataclass(_cls):
+            _build_to_dict(_cls)
 
-# Tool types are now imported from src.type.tool
 
 def convert_claude_tools_to_ollama(claude_tools):
     """Convert Claude Code tools to Ollama format"""
-    from src.const import SUPPORTED_CLAUDE_TOOLS
-    from src.type.tool import OllamaTool, OllamaToolFunction
-    
     ollama_tools = []
+    skipped = []
     
     for tool in claude_tools:
         name = tool.get('name', 'unknown')
-        description = tool.get('description', '')
-        parameters = tool.get('input_schema', {})
-        print(f"Claude Code Tool: {tool}")
+        # 지원하지 않는 도구는 description/schema를 읽기 전에 걸러낸다
+        if name not in SUPPORTED_CLAUDE_TOOLS:
+            skipped.append(name)
+            continue
         
-        if name in SUPPORTED_CLAUDE_TOOLS:
-            # Create proper Ollama tool using dataclass
-            ollama_function = OllamaToolFunction(
-                name=name,
-                description=description,
-                parameters=parameters
-            )
-            ollama_tool = OllamaTool(function=ollama_function)
-            
-            # Convert to dict for API call
-            ollama_tools.append({
-                "type": "function",
-                "function": {
-                    "name": name,
-                    "description": description,
-                    "parameters": parameters
-                }
-            })
-        else:
-            print(f"⚠️  Unsupported tool skipped: {name}")
+        # Build the request dict directly (same shape as OllamaTool)
+        ollama_tools.append({
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": tool.get('description', ''),
+                "parameters": tool.get('input_schema', {})
+            }
+        })
+    
+    log.debug("Claude Code tools: %d received, %d converted", len(claude_tools), len(ollama_tools))
+    if skipped:
+        log.warning("⚠️  Unsupported tools skipped: %s", skipped)
     
     return ollama_tools
 
 def build_message_start(model: str) -> MessageStart:
     return MessageStart(
         message=Message(
-            id=f"msg_{uuid.uuid4().hex[:12]}",
+            id=f"msg_{secrets.token_hex(6)}",
             model=model
         )
     )
 
-def convert_messages_to_ollama_format(messages):
-    """Convert Anthropic messages or string to Ollama chat format"""
-    ollama_messages = []
-    print(f"Convert messages: {messages}")
-    
+# tool_result 한 줄: "Tool {id} result: {content}" / "Tool {id} error: {content}"
+_TOOL_RESULT_LABEL = " result: "
+_TOOL_ERROR_LABEL = " error: "
+
+def iter_ollama_messages(messages):
+    """Anthropic 메시지를 Ollama chat 형식으로 하나씩 변환해서 yield (중간 리스트 없음)"""
     for msg in messages:
         role = msg.get("role", "user")
         content = msg.get("content", "")
         
-        if isinstance(content, list):
+        # 요청 본문은 JSON 디코딩 결과라 정확히 list/dict이므로 isinstance 대신 type 비교
+        if type(content) is list:
             text_parts = []
             tool_results = []
             
+            # type은 항목당 한 번만 조회
             for item in content:
-                if isinstance(item, dict):
-                    if item.get("type") == "text":
+                if type(item) is dict:
+                    item_type = item.get("type")
+                    if item_type == "text":
                         text_parts.append(item.get("text", ""))
-                    elif item.get("type") == "tool_result":
-                        tool_id = item.get("tool_use_id", "")
-                        result_content = item.get("content", "")
-                        if item.get("is_error"):
-                            tool_results.append(f"Tool {tool_id} error: {result_content}")
-                        else:
-                            tool_results.append(f"Tool {tool_id} result: {result_content}")
+                    elif item_type == "tool_result":
+                        label = _TOOL_ERROR_LABEL if item.get("is_error") else _TOOL_RESULT_LABEL
+                        tool_results.append(f"Tool {item.get('tool_use_id', '')}{label}{item.get('content', '')}")
             
-            combined_content = " ".join(text_parts)
             if tool_results:
-                combined_content += "\n\nTool Results:\n" + "\n".join(tool_results)
-            content = combined_content
+                content = "".join((" ".join(text_parts), "\n\nTool Results:\n", "\n".join(tool_results)))
+            else:
+                content = " ".join(text_parts)
             
-        ollama_messages.append({"role": role, "content": content})
-    
-    print(f"Converted messages: {ollama_messages}")
-    return ollama_messages
+        yield {"role": role, "content": content}
 
-def to_sse(event: str, data: object) -> str:
-    """dataclass → JSON → SSE 문자열 변환"""
-    return f"event: {event}\n" + f"data: {json.dumps(asdict(data), ensure_ascii=False)}\n\n"
-
-def build_detailed_tool_instruction(ollama_tools):
-    """Generate strict instruction for Claude Code with Ollama, including tool schema awareness and error handling"""
-    
-    base_instruction = f"""You are **Claude Code Assistant**. 
-Available tools: {', '.join([tool['function']['name'] for tool in ollama_tools])}
+def convert_messages_to_ollama_format(messages):
+    """Convert Anthropic messages or string to Ollama chat format"""
+    # Ollama 요청 본문은 httpx가 json.dumps로 직렬화하고 tool 지시문도 앞에 끼워 넣으므로 리스트로 만든다
+    ollama_messages = list(iter_ollama_messages(messages))
+    log.debug("Converted messages: %s", ollama_messages)
+    return ollama_messages
 
+async def aiter_ndjson_lines(chunks):
+    """Split an async stream of byte chunks (e.g. httpx aiter_bytes) into non-empty NDJSON lines without decoding to str"""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            line = buffer[start:end].strip()
+            if line:
+                yield line
+            start = end + 1
+        buffer = buffer[start:]
+
+    line = buffer.strip()
+    if line:
+        yield line
+
+@functools.lru_cache(maxsize=None)
+def _sse_prefix(event: str) -> bytes:
+    """이벤트 이름별 "event: ...\ndata: " 헤더를 한 번만 인코딩"""
+    return b"event: " + event.encode() + b"\ndata: "
+
+def to_sse(event: str, data: object) -> bytes:
+    """dataclass → JSON → SSE 바이트 변환"""
+    return _sse_prefix(event) + json_dumps(data) + b"\n\n"
+
+# 도구 이름 줄 아래의 지시문 본문은 고정이므로 임포트 시 한 번만 만든다
+_INSTRUCTION_BODY = """
 -------------------------
 CRITICAL DECISION TREE
 -------------------------
@@ -125,11 +188,11 @@ MULTI-STEP TRIGGERS:
 
 -------------------------
 MANDATORY TodoWrite FORMAT (JSON only):
-{{
+{
   "todos": [
-    {{"content": "Clear task description", "status": "pending", "activeForm": "Doing the task"}}
+    {"content": "Clear task description", "status": "pending", "activeForm": "Doing the task"}
   ]
-}}
+}
 
 -------------------------
 TOOL USAGE GUIDELINES:
@@ -161,65 +224,55 @@ RULES:
 - NEVER output malformed JSON for TodoWrite.
 - NEVER output unnecessary explanations about tool internals unless required for user action.
 """
-    return base_instruction
 
-def map_args_to_tool_class(tool_name: str, args: dict):
-    """
-    DEPRECATED: Use convert_ollama_tool_call_to_claude() instead.
-    
-    Maps a dictionary of arguments to the corresponding tool's dataclass instance.
-    This version is simplified to be more robust and readable.
-    """
-    print(f"⚠️  DEPRECATED: map_args_to_tool_class() is deprecated. Use convert_ollama_tool_call_to_claude() instead.")
-    from src.type import TOOL_ARG_CLASSES
-    from dataclasses import fields
-
-    tool_class = TOOL_ARG_CLASSES.get(tool_name)
-    if not tool_class:
-        print(f"⚠️  No dataclass mapping found for tool: {tool_name}")
-        return args  # Return original args if no class is found
-
-    # Get expected argument names from the dataclass fields
-    expected_args = {field.name for field in fields(tool_class)}
-
-    # Filter the received arguments to only include those expected by the dataclass
-    filtered_args = {k: v for k, v in args.items() if k in expected_args}
-
-    # Check for and log any unexpected arguments provided by the model
-    ignored_keys = set(args.keys()) - expected_args
-    if ignored_keys:
-        print(f"⚠️  Ignoring unexpected arguments for {tool_name}: {list(ignored_keys)}")
+def build_detailed_tool_instruction(ollama_tools):
+    """Generate strict instruction for Claude Code with Ollama, including tool schema awareness and error handling"""
+    # 지시문은 도구 이름에만 의존하므로 이름 튜플 단위로 캐시
+    return _build_tool_instruction(tuple(tool['function']['name'] for tool in ollama_tools))
 
-    try:
-        # Instantiate the dataclass with the filtered arguments
-        instance = tool_class(**filtered_args)
-        print(f"✨ Successfully mapped arguments to {tool_name} dataclass.")
-        return instance
-    except TypeError as e:
-        # This will catch errors like missing required arguments
-        print(f"❌ TypeError when instantiating {tool_name}: {e}")
-        print(f"   Provided args: {filtered_args}")
-        return None  # Return None on failure
+@functools.lru_cache(maxsize=64)
+def _build_tool_instruction(tool_names: tuple) -> str:
+    return f"You are **Claude Code Assistant**. \nAvailable tools: {', '.join(tool_names)}\n" + _INSTRUCTION_BODY
 
 def add_tool_instruction(payload, ollama_tools, messages):
     payload["tools"] = ollama_tools
-    print(f"🛠️  Added {len(ollama_tools)} tools to Ollama request:")
-    for tool in ollama_tools:
-        print(f"   - {tool['function']['name']}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("🛠️  Added %d tools to Ollama request: %s",
+                  len(ollama_tools), ", ".join(tool['function']['name'] for tool in ollama_tools))
     
     system_instruction = build_detailed_tool_instruction(ollama_tools)
+    # 같은 messages 리스트에 두 번 호출되어도 지시문은 한 번만 들어가도록 (캐시된 문자열이므로 대개 is 비교로 끝남)
+    if messages and messages[0].get("role") == "system":
+        existing = messages[0].get("content")
+        if existing is system_instruction or existing == system_instruction:
+            return
     system_message = {"role": "system", "content": system_instruction}
-    messages.insert(0, system_message)
-    
-    print(f"🚨 Added system instruction with {len(system_instruction)} characters")
-    print(f"🚨 First 200 chars: {system_instruction[:200]}...")
-    print("🔍 FULL SYSTEM INSTRUCTION BEING SENT:")
-    print("-" * 80)
-    print(system_instruction)
-    print("-" * 80)
-
-from src.const import DEFAULT_SIGNATURE_SECRET
+    # insert(0, ...)는 원소를 하나씩 밀지만 슬라이스 대입은 한 번의 memmove로 끝난다 (payload가 같은 리스트를 참조)
+    messages[:0] = (system_message,)
+    log.debug("🚨 Added system instruction with %d characters", len(system_instruction))
+
 SECRET_KEY = os.getenv("SIGNATURE_SECRET", DEFAULT_SIGNATURE_SECRET)
+_SECRET_BYTES = SECRET_KEY.encode("utf-8")
+# 키 스케줄(ipad/opad)은 한 번만 계산해 두고 서명마다 copy()로 재사용
+# (둘 다 OpenSSL SHA-256을 쓰지만, 매번 키를 다시 처리하는 hmac.digest()보다 짧은 텍스트에서 더 빠름)
+_BASE_HMAC = hmac.new(_SECRET_BYTES, digestmod=hashlib.sha256)
+_b64encode = base64.b64encode
+
+def make_signer(prefix: bytes = b""):
+    """
+    Return an HMAC state already fed with `prefix`.
+
+    스트리밍 중에는 thinking 조각이 올 때마다 update()하고 블록이 끝날 때 finish_signature()로 마무리한다.
+    공통 prefix가 있는 여러 텍스트는 이 상태를 copy()해서 prefix 해시를 다시 계산하지 않는다.
+    """
+    signer = _BASE_HMAC.copy()
+    if prefix:
+        signer.update(prefix)
+    return signer
+
+def finish_signature(signer) -> str:
+    """HMAC state → Base64 signature (the signer itself is left untouched)"""
+    return _b64encode(signer.digest()).decode("ascii")
 
 def generate_signature(text: str) -> str:
     """
@@ -228,13 +281,7 @@ def generate_signature(text: str) -> str:
     if not text:
         return ""
 
-    sig = hmac.new(
-        SECRET_KEY.encode("utf-8"),
-        text.encode("utf-8"),
-        hashlib.sha256
-    ).digest()
-
-    return base64.b64encode(sig).decode("utf-8")
+    return finish_signature(make_signer(text.encode("utf-8")))
 
 
 def get_file_content_as_base64(file_path: str) -> str:
@@ -243,7 +290,7 @@ def get_file_content_as_base64(file_path: str) -> str:
     """
     try:
         with open(file_path, "rb") as f:
-            return base64.b64encode(f.read()).decode('utf-8')
+            return _b64encode(f.read()).decode('ascii')
     except FileNotFoundError:
         print(f"Error: File not found at {file_path}")
         return ""
@@ -251,6 +298,51 @@ def get_file_content_as_base64(file_path: str) -> str:
         print(f"Error reading file {file_path}: {e}")
         return ""
 
+# ---- 도구 인자 변환기 ----
+# 인자 타입은 도구별로 고정이므로, 필드마다 변환 함수를 한 번만 골라 두고 호출마다 재사용한다.
+_SKIP_ARG = object()
+_GREP_ALIAS_FIELDS = frozenset(('A', 'B', 'C', 'n', 'i'))
+
+def _coerce_list(field_name, value):
+    if not isinstance(value, list):
+        log.warning("⚠️  Expected list for %s, got %s", field_name, type(value))
+        return _SKIP_ARG
+    return value
+
+def _coerce_str(field_name, value):
+    return str(value)
+
+def _coerce_int(field_name, value):
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            log.warning("⚠️  Could not convert %r to int for %s", value, field_name)
+            return _SKIP_ARG
+    return int(value)
+
+def _coerce_bool(field_name, value):
+    if isinstance(value, str):
+        # Convert string booleans
+        return value.lower() in ('true', '1', 'yes')
+    return bool(value)
+
+def _coerce_passthrough(field_name, value):
+    # For complex types, just pass through
+    return value
+
+_ARG_COERCERS = {str: _coerce_str, int: _coerce_int, bool: _coerce_bool}
+
+@functools.lru_cache(maxsize=None)
+def _tool_arg_converters(tool_name: str) -> tuple:
+    """(field_name, alt_key, coerce) 튜플 목록을 도구별로 한 번만 만든다"""
+    converters = []
+    for field_name, target_type, is_list in TOOL_ARG_SPECS[tool_name].fields:
+        alt_key = f"-{field_name}" if tool_name == "Grep" and field_name in _GREP_ALIAS_FIELDS else None
+        coerce = _coerce_list if is_list else _ARG_COERCERS.get(target_type, _coerce_passthrough)
+        converters.append((field_name, alt_key, coerce))
+    return tuple(converters)
+
 def convert_ollama_tool_call_to_claude(ollama_tool_call: 'ToolCall') -> 'ClaudeToolCall':
     """
     Convert Ollama ToolCall dataclass to Claude ClaudeToolCall dataclass with proper argument validation.
@@ -261,10 +353,7 @@ def convert_ollama_tool_call_to_claude(ollama_tool_call: 'ToolCall') -> 'ClaudeT
     Returns:
         ClaudeToolCall: Claude Code compatible tool call format
     """
-    from src.type import TOOL_ARG_CLASSES
-    from src.type.tool import ClaudeToolCall, ToolCall
-    from dataclasses import fields
-    
+
     if not isinstance(ollama_tool_call, ToolCall):
         raise TypeError(f"Expected ToolCall dataclass, got {type(ollama_tool_call)}")
     
@@ -272,115 +361,67 @@ def convert_ollama_tool_call_to_claude(ollama_tool_call: 'ToolCall') -> 'ClaudeT
     tool_name = ollama_tool_call.function.name
     raw_arguments = ollama_tool_call.function.arguments
     
-    print(f"🔧 Converting ToolCall: {tool_name}")
-    print(f"   Raw arguments: {raw_arguments}")
+    log.debug("🔧 Converting ToolCall: %s, raw arguments: %s", tool_name, raw_arguments)
     
     # Parse arguments if they're in string format
     if isinstance(raw_arguments, str):
         try:
             raw_arguments = json.loads(raw_arguments)
         except json.JSONDecodeError as e:
-            print(f"❌ Failed to parse arguments JSON for {tool_name}: {e}")
+            log.warning("❌ Failed to parse arguments JSON for %s: %s", tool_name, e)
             return None
     
-    # Get the tool's dataclass for validation
-    tool_class = TOOL_ARG_CLASSES.get(tool_name)
-    if not tool_class:
-        print(f"⚠️  No dataclass mapping found for tool: {tool_name}")
+    # Get the tool's prebuilt validation spec
+    spec = TOOL_ARG_SPECS.get(tool_name)
+    if not spec:
+        log.warning("⚠️  No dataclass mapping found for tool: %s", tool_name)
         # Return basic format without validation using dataclass
         return ClaudeToolCall(
             type="tool_use",
-            id=f"toolu_{uuid.uuid4().hex[:12]}",
+            id=f"toolu_{secrets.token_hex(6)}",
             name=tool_name,
             input=raw_arguments
         )
     
-    # Get expected field names and types from dataclass
-    expected_fields = {field.name: field.type for field in fields(tool_class)}
     validated_args = {}
     
-    # Validate and convert each argument
-    for field_name, field_type in expected_fields.items():
+    # Validate and convert each argument with the tool's prebuilt converters
+    for field_name, alt_key, coerce in _tool_arg_converters(tool_name):
         if field_name in raw_arguments:
-            value = raw_arguments[field_name]
-            
-            # Handle special parameter name mappings for Grep tool
-            if tool_name == "Grep":
-                # Map '-A', '-B', '-C', '-n', '-i' parameters
-                if field_name in ['A', 'B', 'C', 'n', 'i']:
-                    # These might come as '-A', '-B', etc. from Ollama
-                    alt_key = f"-{field_name}"
-                    if alt_key in raw_arguments:
-                        value = raw_arguments[alt_key]
-                    elif field_name not in raw_arguments:
-                        continue  # Skip if not present
+            # Grep: '-A', '-B' 등으로 들어온 값이 있으면 그쪽을 우선
+            if alt_key is not None and alt_key in raw_arguments:
+                value = raw_arguments[alt_key]
+            else:
+                value = raw_arguments[field_name]
             
-            # Type conversion and validation
             try:
-                # Handle optional types
-                if hasattr(field_type, '__origin__') and field_type.__origin__ is Union:
-                    # Optional[Type] handling
-                    args = field_type.__args__
-                    if type(None) in args:
-                        # This is Optional[SomeType]
-                        non_none_types = [arg for arg in args if arg != type(None)]
-                        if non_none_types:
-                            target_type = non_none_types[0]
-                        else:
-                            target_type = str
-                    else:
-                        target_type = args[0]
-                else:
-                    target_type = field_type
-                
-                # Handle List types
-                if hasattr(target_type, '__origin__') and target_type.__origin__ is list:
-                    if not isinstance(value, list):
-                        print(f"⚠️  Expected list for {field_name}, got {type(value)}")
-                        continue
-                    validated_args[field_name] = value
-                # Handle basic types
-                elif target_type in [str, int, bool]:
-                    if target_type == bool and isinstance(value, str):
-                        # Convert string booleans
-                        validated_args[field_name] = value.lower() in ['true', '1', 'yes']
-                    elif target_type == int and isinstance(value, str):
-                        try:
-                            validated_args[field_name] = int(value)
-                        except ValueError:
-                            print(f"⚠️  Could not convert '{value}' to int for {field_name}")
-                            continue
-                    else:
-                        validated_args[field_name] = target_type(value)
-                else:
-                    # For complex types, just pass through
-                    validated_args[field_name] = value
-                    
+                value = coerce(field_name, value)
             except (ValueError, TypeError) as e:
-                print(f"⚠️  Type conversion error for {field_name}: {e}")
+                log.warning("⚠️  Type conversion error for %s: %s", field_name, e)
                 continue
+            if value is not _SKIP_ARG:
+                validated_args[field_name] = value
     
     # Check for required fields
-    required_fields = [field.name for field in fields(tool_class) 
-                      if field.default == MISSING and field.default_factory == MISSING]
+    required_fields = spec.required
     
     missing_fields = [field for field in required_fields if field not in validated_args]
     if missing_fields:
-        print(f"❌ Missing required fields for {tool_name}: {missing_fields}")
+        log.warning("❌ Missing required fields for %s: %s", tool_name, missing_fields)
         # Still return the tool call, let Claude Code handle the error
     
     # Additional arguments not in dataclass
-    extra_args = {k: v for k, v in raw_arguments.items() if k not in expected_fields}
+    extra_args = {k: v for k, v in raw_arguments.items() if k not in spec.names}
     if extra_args:
-        print(f"⚠️  Extra arguments for {tool_name} (will be included): {list(extra_args.keys())}")
+        log.warning("⚠️  Extra arguments for %s (will be included): %s", tool_name, list(extra_args))
         validated_args.update(extra_args)
     
-    print(f"✅ Validated arguments for {tool_name}: {validated_args}")
+    log.debug("✅ Validated arguments for %s: %s", tool_name, validated_args)
     
     # Return Claude Code format using dataclass
     return ClaudeToolCall(
         type="tool_use",
-        id=f"toolu_{uuid.uuid4().hex[:12]}",
+        id=f"toolu_{secrets.token_hex(6)}",
         name=tool_name,
         input=validated_args
     )
@@ -395,8 +436,7 @@ def dict_to_ollama_tool_call(tool_call_dict: dict) -> 'ToolCall':
     Returns:
         ToolCall: Structured Ollama tool call
     """
-    from src.type.tool import ToolCall, ToolFunctionCall
-    
+
     if not isinstance(tool_call_dict, dict) or 'function' not in tool_call_dict:
         raise ValueError(f"Invalid tool call dict format: {tool_call_dict}")
     
@@ -406,7 +446,6 @@ def dict_to_ollama_tool_call(tool_call_dict: dict) -> 'ToolCall':
     
     # Parse arguments if they're in string format
     if isinstance(arguments, str):
-        import json
         try:
             arguments = json.loads(arguments)
         except json.JSONDecodeError as e:
@@ -426,8 +465,7 @@ def create_ollama_tool_call(name: str, arguments: dict) -> 'ToolCall':
     Returns:
         ToolCall: Structured Ollama tool call
     """
-    from src.type.tool import ToolCall, ToolFunctionCall
-    
+
     function = ToolFunctionCall(name=name, arguments=arguments)
     return ToolCall(function=function)
 
@@ -443,10 +481,9 @@ def create_claude_tool_call(name: str, arguments: dict, tool_id: str = None) ->
     Returns:
         ClaudeToolCall: Structured Claude tool call
     """
-    from src.type.tool import ClaudeToolCall
     
     if tool_id is None:
-        tool_id = f"toolu_{uuid.uuid4().hex[:12]}"
+        tool_id = f"toolu_{secrets.token_hex(6)}"
         
     return ClaudeToolCall(
         type="tool_use",
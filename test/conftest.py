@@ -0,0 +1,18 @@
+"""
+Shared pytest configuration for the router test suites
+"""
+import asyncio
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (and unavailable on Windows); the default loop works the same
+    uvloop = None
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run every pytest-asyncio loop on uvloop when it is installed"""
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
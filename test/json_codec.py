@@ -0,0 +1,26 @@
+"""
+JSON codec shared by the router test suites and the test runner
+Uses orjson when it is installed, otherwise the stdlib json module
+"""
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib codec
+    orjson = None
+
+# 둘 다 bytes/str를 그대로 받으며, 디코드 실패는 ValueError 하위 타입으로 올라온다
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj, pretty=False):
+        """Serialize to UTF-8 JSON bytes (compact unless pretty); unknown types go through str()"""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0, default=str)
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj, pretty=False):
+        """Serialize to UTF-8 JSON bytes (compact unless pretty); unknown types go through str()"""
+        if pretty:
+            return json.dumps(obj, default=str, indent=2).encode()
+        return json.dumps(obj, default=str, separators=(",", ":")).encode()
@@ -3,93 +3,233 @@
 Claude Router Comprehensive Test Runner
 Runs all Claude Code tools tests and generates detailed reports
 """
+import asyncio
+import http.client
+import io
+import logging
+import os
 import sys
 import time
-import subprocess
-import requests
+from collections import Counter
 from pathlib import Path
-import json
-from datetime import datetime
+from urllib.parse import urlsplit
+
+from json_codec import json_dumps, json_loads
+
+# 사용자 출력은 print 대신 16 KiB 버퍼의 로거로 모으고 테스트/섹션 단위로 flush
+_handler = logging.StreamHandler(io.TextIOWrapper(
+    io.BufferedWriter(io.FileIO(sys.stdout.fileno(), 'w', closefd=False), buffer_size=16 * 1024),
+    encoding='utf-8', line_buffering=False, write_through=False))
+_handler.setFormatter(logging.Formatter('%(message)s'))
+log = logging.getLogger("claude_router.tests")
+log.addHandler(_handler)
+log.setLevel(logging.INFO)
+log.propagate = False
+
+_STATUS_EMOJI = {
+    "PASSED": "✅",
+    "FAILED": "❌",
+    "TIMEOUT": "⏰",
+    "ERROR": "💥",
+    "NOT_FOUND": "🔍"
+}
+
+_FAILED_STATUSES = frozenset({"FAILED", "ERROR", "TIMEOUT"})
+
+# router_url -> (checked_at, model); 정상 응답만 30초 동안 재사용
+_HEALTH_TTL = 30.0
+_HEALTH_CACHE = {}
+
+_LOG_TAIL_BYTES = 4096
+
+def _tail_bytes(path, size):
+    """Return the last `size` bytes of a file"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(f.tell() - size, 0))
+        return f.read()
+
+async def _run_one(test_dir, test_file_name, python=sys.executable, env=None):
+    """Run a single test file in a subprocess and return (test_name, result)"""
+    test_file = test_dir / test_file_name
+    test_name = test_file.stem
+
+    if not test_file.exists():
+        return test_name, {
+            "status": "NOT_FOUND",
+            "duration": 0.0,
+            "stdout": "",
+            "stderr": f"Test file {test_file_name} not found",
+            "return_code": -1
+        }
+
+    # 자식 출력은 메모리에 모으지 않고 로그 파일로 보내고, 리포트에는 경로와 끝부분만 남김
+    # 자식의 stdout/stderr fd가 파일을 직접 가리키므로 PIPE 버퍼가 차서 자식이 멈추는 일이 없음
+    logs_dir = test_dir / "logs"
+    logs_dir.mkdir(exist_ok=True)
+    out_path = logs_dir / f"{test_name}.out.log"
+    err_path = logs_dir / f"{test_name}.err.log"
+
+    loop = asyncio.get_running_loop()
+    proc = None
+    try:
+        start_time = loop.time()
+        with open(out_path, 'wb', buffering=64 * 1024) as out, \
+             open(err_path, 'wb', buffering=64 * 1024) as err:
+            proc = await asyncio.create_subprocess_exec(
+                python, str(test_file),
+                stdout=out,
+                stderr=err,
+                cwd=test_dir.parent,
+                env=env
+            )
+            # 2 minute timeout per test file
+            await asyncio.wait_for(proc.wait(), timeout=120)
+        duration = loop.time() - start_time
+
+        return test_name, {
+            "status": "PASSED" if proc.returncode == 0 else "FAILED",
+            "duration": duration,
+            "stdout": _tail_bytes(out_path, _LOG_TAIL_BYTES).decode(errors="replace"),
+            "stderr": _tail_bytes(err_path, _LOG_TAIL_BYTES).decode(errors="replace"),
+            "stdout_path": str(out_path),
+            "stderr_path": str(err_path),
+            "return_code": proc.returncode
+        }
+
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return test_name, {
+            "status": "TIMEOUT",
+            "duration": 120.0,
+            "stdout": "",
+            "stderr": "Test timed out after 120 seconds",
+            "return_code": -1
+        }
+
+    except Exception as e:
+        return test_name, {
+            "status": "ERROR",
+            "duration": 0.0,
+            "stdout": "",
+            "stderr": str(e),
+            "return_code": -1
+        }
+
+def _atomic_write_json(path, data, pretty=False):
+    """Write JSON to a temp file and os.replace it so readers never see a partial file"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    # 전체를 bytes로 한 번에 직렬화해 write 한 번으로 기록
+    with open(tmp_path, 'wb') as f:
+        f.write(json_dumps(data, pretty=pretty))
+    os.replace(tmp_path, path)
+
+def _project_src_mtime_ns(src_dir):
+    """Latest mtime across the router source tree; any edit invalidates cached passes"""
+    return max((p.stat().st_mtime_ns for p in src_dir.rglob("*") if p.is_file()), default=0)
+
+def _shared_test_mtime_ns(test_dir):
+    """Latest mtime across the shared test modules (tool_schemas.py, conftest.py, ...) and pytest.ini"""
+    # 모든 test_* 스위트가 공유하므로 하나라도 바뀌면 캐시된 통과 결과를 전부 무효화
+    shared = [p for p in test_dir.glob("*.py") if not p.name.startswith("test_")]
+    shared.append(test_dir / "pytest.ini")
+    return max((p.stat().st_mtime_ns for p in shared if p.exists()), default=0)
+
+def _load_manifest(path):
+    """Load the cached run manifest, treating a missing or corrupt file as empty"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        return json_loads(data)
+    except (OSError, ValueError):
+        return {}
+
+def _print_result(test_name, result):
+    """Print a one-line progress entry for a finished test"""
+    status = result["status"]
+    duration = result["duration"]
+    if status == "PASSED":
+        log.info(f"✅ {test_name} PASSED ({duration:.2f}s)")
+    elif status == "FAILED":
+        log.info(f"❌ {test_name} FAILED ({duration:.2f}s)")
+        if result["stderr"]:
+            log.info(f"   Error: {result['stderr'].strip()}")
+    elif status == "TIMEOUT":
+        log.info(f"⏰ {test_name} TIMEOUT (120.0s)")
+    elif status == "NOT_FOUND":
+        log.info(f"⚠️  Test file not found: {test_name}.py")
+    else:
+        log.info(f"💥 {test_name} ERROR: {result['stderr']}")
 
 class ClaudeRouterTestRunner:
-    def __init__(self):
+    def __init__(self, use_cache=True):
         self.test_dir = Path(__file__).parent
+        self.report_file = self.test_dir / "test_results.json"
+        self.manifest_file = self.test_dir / ".cache" / "manifest.json"
+        self.use_cache = use_cache
+        # 자식 프로세스 실행 인자는 한 번만 만들어 두고, 매 실행마다 .pyc를 쓰지 않도록 함
+        self._python = sys.executable
+        self._child_env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
         self.router_url = "http://localhost:4000"
+        self._health_conn = None
+        self.router_model = None
         self.results = {}
         self.start_time = None
-        self.end_time = None
+        self.total_duration = 0.0
         
+    def _get_health(self):
+        """GET /health over a persistent http.client connection; returns (status, body)"""
+        # requests 스택 없이 단일 GET만 하므로 http.client로 충분. 끊긴 keep-alive 연결은 한 번 재접속
+        for attempt in range(2):
+            reused = self._health_conn is not None
+            if not reused:
+                url = urlsplit(self.router_url)
+                self._health_conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=5)
+            try:
+                self._health_conn.request("GET", "/health")
+                response = self._health_conn.getresponse()
+                return response.status, response.read()
+            except (http.client.BadStatusLine, ConnectionResetError, BrokenPipeError):
+                self._health_conn.close()
+                self._health_conn = None
+                if not reused or attempt:
+                    raise
+            except (OSError, http.client.HTTPException):
+                self._health_conn.close()
+                self._health_conn = None
+                raise
+
     def check_router_health(self):
         """Verify Claude Router is running and healthy"""
-        print("🔍 Checking Claude Router health...")
+        log.info("🔍 Checking Claude Router health...")
+        cached = _HEALTH_CACHE.get(self.router_url)
+        if cached is not None and time.monotonic() - cached[0] < _HEALTH_TTL:
+            self.router_model = cached[1]
+            log.info(f"✅ Router healthy - Model: {cached[1]} (cached)")
+            return True
         try:
-            response = requests.get(f"{self.router_url}/health", timeout=5)
-            if response.status_code == 200:
-                health_data = response.json()
+            status, body = self._get_health()
+            if status == 200:
+                health_data = json_loads(body)
                 if health_data.get("status") == "ok":
-                    print(f"✅ Router healthy - Model: {health_data.get('model', 'unknown')}")
+                    model = health_data.get('model', 'unknown')
+                    _HEALTH_CACHE[self.router_url] = (time.monotonic(), model)
+                    self.router_model = model
+                    log.info(f"✅ Router healthy - Model: {model}")
                     return True
-            print(f"❌ Router health check failed - Status: {response.status_code}")
+            log.info(f"❌ Router health check failed - Status: {status}")
             return False
-        except requests.exceptions.RequestException as e:
-            print(f"❌ Router connection failed: {e}")
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            log.info(f"❌ Router connection failed: {e}")
             return False
     
-    def run_test_file(self, test_file):
-        """Run a single test file and capture results"""
-        test_name = test_file.stem
-        print(f"\n🧪 Running {test_name}...")
-        
-        try:
-            start_time = time.time()
-            result = subprocess.run([
-                sys.executable, str(test_file)
-            ], 
-            capture_output=True, 
-            text=True, 
-            timeout=120,  # 2 minute timeout per test file
-            cwd=self.test_dir.parent
-            )
-            
-            end_time = time.time()
-            duration = end_time - start_time
-            
-            self.results[test_name] = {
-                "status": "PASSED" if result.returncode == 0 else "FAILED",
-                "duration": duration,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "return_code": result.returncode
-            }
-            
-            if result.returncode == 0:
-                print(f"✅ {test_name} PASSED ({duration:.2f}s)")
-            else:
-                print(f"❌ {test_name} FAILED ({duration:.2f}s)")
-                if result.stderr:
-                    print(f"   Error: {result.stderr.strip()}")
-                    
-        except subprocess.TimeoutExpired:
-            self.results[test_name] = {
-                "status": "TIMEOUT",
-                "duration": 120.0,
-                "stdout": "",
-                "stderr": "Test timed out after 120 seconds",
-                "return_code": -1
-            }
-            print(f"⏰ {test_name} TIMEOUT (120.0s)")
-            
-        except Exception as e:
-            self.results[test_name] = {
-                "status": "ERROR",
-                "duration": 0.0,
-                "stdout": "",
-                "stderr": str(e),
-                "return_code": -1
-            }
-            print(f"💥 {test_name} ERROR: {e}")
-    
-    def run_all_tests(self):
+    def _write_results_atomic(self):
+        """Persist results collected so far; survives a crash or Ctrl-C mid-suite"""
+        # 모든 테스트가 한 이벤트 루프 스레드에서 완료 처리되므로 별도 락은 필요 없음
+        _atomic_write_json(self.report_file, {"results": self.results, "partial": True})
+
+    async def run_all_tests(self):
         """Run all test files in the test directory"""
         test_files = [
             "test_claude_tools_comprehensive.py",
@@ -98,100 +238,132 @@ class ClaudeRouterTestRunner:
             "test_search_tools.py",
             "test_web_tools.py",
             "test_notebook_and_ide_tools.py",
-            "test_task_management_tools.py"
+            "test_task_management_tools.py",
+            "test_non_streaming_response.py"
         ]
         
-        print("🚀 Starting Claude Router comprehensive test suite...")
+        log.info("🚀 Starting Claude Router comprehensive test suite...")
+        # datetime은 리포트 timestamp에만 필요하므로 여기서 import, 소요 시간은 monotonic으로 측정
+        from datetime import datetime
         self.start_time = datetime.now()
+        start_ns = time.monotonic_ns()
         
         # Check router health first
         if not self.check_router_health():
-            print("\n❌ Router health check failed. Please ensure Claude Router is running.")
-            print("   Run: ./run.sh")
+            log.info("\n❌ Router health check failed. Please ensure Claude Router is running.")
+            log.info("   Run: ./run.sh")
             return False
         
-        # Run each test file
+        # 테스트 파일, 공유 테스트 모듈, src 트리와 대상 라우터/모델이 그대로이고 지난번에 통과했다면 다시 실행하지 않음
+        manifest = _load_manifest(self.manifest_file) if self.use_cache else {}
+        src_mtime_ns = _project_src_mtime_ns(self.test_dir.parent / "src")
+        shared_mtime_ns = _shared_test_mtime_ns(self.test_dir)
+        keys = {}
+        pending = []
         for test_file_name in test_files:
             test_file = self.test_dir / test_file_name
+            test_name = test_file.stem
             if test_file.exists():
-                self.run_test_file(test_file)
-            else:
-                print(f"⚠️  Test file not found: {test_file_name}")
-                self.results[test_file_name.replace('.py', '')] = {
-                    "status": "NOT_FOUND",
-                    "duration": 0.0,
-                    "stdout": "",
-                    "stderr": f"Test file {test_file_name} not found",
-                    "return_code": -1
-                }
+                keys[test_name] = [test_file.stat().st_mtime_ns, src_mtime_ns, shared_mtime_ns,
+                                   self.router_url, self.router_model]
+                entry = manifest.get(test_name)
+                if entry and entry["key"] == keys[test_name] and entry["result"]["status"] == "PASSED":
+                    self.results[test_name] = {**entry["result"], "cached": True}
+                    log.info(f"♻️  {test_name} PASSED (cached)")
+                    continue
+            pending.append(test_file_name)
+
+        # 테스트 파일끼리 의존성이 없으므로 하나의 이벤트 루프에서 subprocess를 동시에 실행
+        log.info(f"\n🧪 Running {len(pending)} test files in parallel...")
+        _handler.flush()
+        for task in asyncio.as_completed([
+            _run_one(self.test_dir, name, self._python, self._child_env) for name in pending
+        ]):
+            test_name, result = await task
+            self.results[test_name] = result
+            _print_result(test_name, result)
+            _handler.flush()
+            self._write_results_atomic()
+            if test_name in keys:
+                manifest[test_name] = {"key": keys[test_name], "result": result}
+                self.manifest_file.parent.mkdir(exist_ok=True)
+                _atomic_write_json(self.manifest_file, manifest)
+
+        # 리포트는 완료 순서가 아니라 test_files 순서로 유지
+        self.results = {
+            name: self.results[name]
+            for name in (Path(test_file_name).stem for test_file_name in test_files)
+        }
         
-        self.end_time = datetime.now()
+        self.total_duration = (time.monotonic_ns() - start_ns) / 1e9
         return True
     
     def generate_report(self):
         """Generate comprehensive test report"""
         if not self.results:
-            print("No test results to report")
+            log.info("No test results to report")
             return
             
-        total_duration = (self.end_time - self.start_time).total_seconds()
+        total_duration = self.total_duration
         
         # Count results by status
-        passed = sum(1 for r in self.results.values() if r["status"] == "PASSED")
-        failed = sum(1 for r in self.results.values() if r["status"] == "FAILED") 
-        timeout = sum(1 for r in self.results.values() if r["status"] == "TIMEOUT")
-        error = sum(1 for r in self.results.values() if r["status"] == "ERROR")
-        not_found = sum(1 for r in self.results.values() if r["status"] == "NOT_FOUND")
+        counts = Counter(r["status"] for r in self.results.values())
+        passed = counts["PASSED"]
+        failed = counts["FAILED"]
+        timeout = counts["TIMEOUT"]
+        error = counts["ERROR"]
+        not_found = counts["NOT_FOUND"]
         
         total_tests = len(self.results)
         
-        print(f"\n{'='*60}")
-        print(f"📊 CLAUDE ROUTER TEST RESULTS SUMMARY")
-        print(f"{'='*60}")
-        print(f"🕐 Total Runtime: {total_duration:.2f}s")
-        print(f"📁 Total Test Suites: {total_tests}")
-        print(f"✅ Passed: {passed}")
-        print(f"❌ Failed: {failed}")
-        print(f"⏰ Timeout: {timeout}")
-        print(f"💥 Error: {error}")
-        print(f"🔍 Not Found: {not_found}")
-        print(f"📈 Success Rate: {(passed/total_tests)*100:.1f}%")
-        
-        print(f"\n{'='*60}")
-        print(f"📋 DETAILED RESULTS")
-        print(f"{'='*60}")
+        # 섹션마다 줄을 모았다가 한 번의 log 호출로 내보냄
+        lines = [
+            f"\n{'='*60}",
+            f"📊 CLAUDE ROUTER TEST RESULTS SUMMARY",
+            f"{'='*60}",
+            f"🕐 Total Runtime: {total_duration:.2f}s",
+            f"📁 Total Test Suites: {total_tests}",
+            f"✅ Passed: {passed}",
+            f"❌ Failed: {failed}",
+            f"⏰ Timeout: {timeout}",
+            f"💥 Error: {error}",
+            f"🔍 Not Found: {not_found}",
+            f"📈 Success Rate: {(passed/total_tests)*100:.1f}%",
+            f"\n{'='*60}",
+            f"📋 DETAILED RESULTS",
+            f"{'='*60}",
+        ]
         
+        # 상세 결과를 찍는 루프에서 실패 목록도 함께 모아 결과를 한 번만 순회
+        failed_list = []
         for test_name, result in self.results.items():
-            status_emoji = {
-                "PASSED": "✅",
-                "FAILED": "❌", 
-                "TIMEOUT": "⏰",
-                "ERROR": "💥",
-                "NOT_FOUND": "🔍"
-            }.get(result["status"], "❓")
+            status_emoji = _STATUS_EMOJI.get(result["status"], "❓")
             
-            print(f"{status_emoji} {test_name:<35} {result['status']:<10} ({result['duration']:.2f}s)")
+            lines.append(f"{status_emoji} {test_name:<35} {result['status']:<10} ({result['duration']:.2f}s)")
             
-            if result["status"] in ["FAILED", "ERROR", "TIMEOUT"] and result["stderr"]:
-                print(f"   └─ {result['stderr'].strip()}")
+            if result["status"] in _FAILED_STATUSES:
+                failed_list.append((test_name, result))
+                if result["stderr"]:
+                    lines.append(f"   └─ {result['stderr'].strip()}")
+        log.info("\n".join(lines))
         
         # Show failed test details
-        failed_tests = {name: result for name, result in self.results.items() 
-                       if result["status"] in ["FAILED", "ERROR", "TIMEOUT"]}
-        
-        if failed_tests:
-            print(f"\n{'='*60}")
-            print(f"🔍 FAILED TESTS ANALYSIS")
-            print(f"{'='*60}")
+        if failed_list:
+            lines = [
+                f"\n{'='*60}",
+                f"🔍 FAILED TESTS ANALYSIS",
+                f"{'='*60}",
+            ]
             
-            for test_name, result in failed_tests.items():
-                print(f"\n❌ {test_name}:")
-                print(f"   Status: {result['status']}")
-                print(f"   Duration: {result['duration']:.2f}s")
+            for test_name, result in failed_list:
+                lines.append(f"\n❌ {test_name}:")
+                lines.append(f"   Status: {result['status']}")
+                lines.append(f"   Duration: {result['duration']:.2f}s")
                 if result['stderr']:
-                    print(f"   Error: {result['stderr'].strip()}")
+                    lines.append(f"   Error: {result['stderr'].strip()}")
                 if result['stdout']:
-                    print(f"   Output: {result['stdout'].strip()}")
+                    lines.append(f"   Output: {result['stdout'].strip()}")
+            log.info("\n".join(lines))
         
         # Save detailed report to file
         report_data = {
@@ -209,34 +381,43 @@ class ClaudeRouterTestRunner:
             "results": self.results
         }
         
-        report_file = self.test_dir / "test_results.json"
-        with open(report_file, 'w') as f:
-            json.dump(report_data, f, indent=2, default=str)
+        # 기본은 compact JSON, 사람이 읽을 때만 CLAUDE_ROUTER_PRETTY=1로 들여쓰기
+        _atomic_write_json(self.report_file, report_data,
+                           pretty=bool(os.environ.get("CLAUDE_ROUTER_PRETTY")))
         
-        print(f"\n💾 Detailed report saved to: {report_file}")
+        log.info(f"\n💾 Detailed report saved to: {self.report_file}")
         
+        _handler.flush()
+
         # Return overall success
-        return failed + timeout + error == 0
+        return not any(counts[status] for status in _FAILED_STATUSES)
 
 def main():
     """Main test runner entry point"""
-    runner = ClaudeRouterTestRunner()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Claude Router comprehensive test runner")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-run every test even if its cached result is still valid")
+    args = parser.parse_args()
+
+    runner = ClaudeRouterTestRunner(use_cache=not args.no_cache)
     
-    print("🧪 Claude Router Comprehensive Test Suite")
-    print("=" * 50)
+    log.info("🧪 Claude Router Comprehensive Test Suite")
+    log.info("=" * 50)
     
-    success = runner.run_all_tests()
+    success = asyncio.run(runner.run_all_tests())
     if success:
         overall_success = runner.generate_report()
         
         if overall_success:
-            print("\n🎉 All tests passed successfully!")
+            log.info("\n🎉 All tests passed successfully!")
             sys.exit(0)
         else:
-            print("\n❌ Some tests failed. Check the report above for details.")
+            log.info("\n❌ Some tests failed. Check the report above for details.")
             sys.exit(1)
     else:
-        print("\n💥 Test execution failed.")
+        log.info("\n💥 Test execution failed.")
         sys.exit(1)
 
 if __name__ == "__main__":
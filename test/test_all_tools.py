@@ -2,8 +2,34 @@
 """
 Test all Claude Code tools through the router
 """
-import json
+import atexit
+import re
 import requests
+from requests.adapters import HTTPAdapter
+
+from json_codec import json_dumps, json_loads
+
+# 완성된 줄 단위로만 매칭하도록 줄바꿈까지 포함
+_SSE_DATA = re.compile(rb'^data: ([^\r\n]*)\r?\n', re.MULTILINE)
+
+def _iter_sse_payloads(chunks):
+    """Yield the payload of every complete `data:` line from a stream of byte chunks"""
+    buf = bytearray()
+    for chunk in chunks:
+        buf += chunk
+        end = buf.rfind(b'\n') + 1
+        if not end:
+            continue
+        # memoryview로 매칭해 버퍼를 줄마다 잘라 복사하지 않음; 버퍼를 줄이기 전에 view를 해제
+        with memoryview(buf) as view:
+            payloads = [m.group(1) for m in _SSE_DATA.finditer(view, 0, end)]
+        del buf[:end]
+        yield from payloads
+
+# 모든 HTTP 호출이 커넥션 풀을 공유하도록 모듈 단위 Session 사용
+_session = requests.Session()
+_session.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0))
+atexit.register(_session.close)
 
 def test_comprehensive_tools():
     url = "http://localhost:4000/v1/messages"
@@ -79,22 +105,24 @@ def test_comprehensive_tools():
     print(f"📤 Sending request with {len(payload['tools'])} tools")
     
     try:
-        response = requests.post(url, json=payload, stream=True, timeout=30)
+        response = _session.post(url, data=json_dumps(payload), headers={"Content-Type": "application/json"}, stream=True, timeout=30)
         response.raise_for_status()
         
         print("📥 Response stream:")
-        for line in response.iter_lines(decode_unicode=True):
-            if line.strip() and 'data:' in line:
-                try:
-                    data = json.loads(line.split('data: ')[1])
-                    if data.get('type') == 'content_block_start' and 'tool_use' in str(data):
-                        tool_info = data.get('content_block', {})
-                        print(f"🛠️  Tool used: {tool_info.get('name')} - {tool_info.get('input')}")
-                    elif data.get('type') == 'content_block_start' and 'tool_result' in str(data):
-                        result = data.get('content_block', {}).get('content', '')
-                        print(f"✅ Tool result: {result}")
-                except:
-                    pass
+        # 줄 단위 UTF-8 디코딩 없이 도착한 청크를 그대로 훑어 "data: " 줄만 꺼냄
+        for payload in _iter_sse_payloads(response.iter_content(chunk_size=65536)):
+            try:
+                data = json_loads(payload)
+            except ValueError:
+                continue
+            if data.get('type') != 'content_block_start':
+                continue
+            block = data.get('content_block', {})
+            block_type = block.get('type')
+            if block_type == 'tool_use':
+                print(f"🛠️  Tool used: {block.get('name')} - {block.get('input')}")
+            elif block_type == 'tool_result':
+                print(f"✅ Tool result: {block.get('content', '')}")
                     
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -3,73 +3,133 @@
 Comprehensive test suite for all Claude Code tools through the Claude Router
 Tests all 19 supported Claude Code tools to ensure proper format conversion and execution
 """
-import requests
-import json
-import time
 import os
-import tempfile
-from pathlib import Path
+import httpx
 import pytest
-
-class ClaudeToolTester:
-    def __init__(self, router_url="http://localhost:4000"):
+import pytest_asyncio
+
+from json_codec import json_dumps, json_loads
+from tool_schemas import TOOLS
+
+def _interesting(data_part, capture_text):
+    """Cheap substring pre-check so frames we never inspect skip JSON decoding"""
+    if b'"content_block_start"' in data_part or b'"input_json_delta"' in data_part:
+        return True
+    return capture_text and b'"text_delta"' in data_part
+
+def _on_block_start(event_data, tool_calls, content_parts):
+    block = event_data['content_block']
+    if block['type'] == 'tool_use':
+        # input은 뒤따르는 input_json_delta 조각으로 오므로 index와 함께 모아 둔다
+        block['_index'] = event_data['index']
+        block['_partial_json'] = []
+        tool_calls.append(block)
+
+def _on_block_delta(event_data, tool_calls, content_parts):
+    delta = event_data['delta']
+    if delta['type'] == 'text_delta':
+        content_parts.append(delta['text'])
+    elif delta['type'] == 'input_json_delta' and tool_calls and tool_calls[-1]['_index'] == event_data['index']:
+        tool_calls[-1]['_partial_json'].append(delta['partial_json'])
+
+def _finish_tool_call(block):
+    """Replace the collected partial_json pieces with the decoded input (a bad payload raises ValueError)"""
+    del block['_index']
+    partial_json = ''.join(block.pop('_partial_json'))
+    block['input'] = json_loads(partial_json) if partial_json else {}
+    return block
+
+# 이벤트 type별 처리 함수; 나머지 이벤트는 무시
+_HANDLERS = {
+    'content_block_start': _on_block_start,
+    'content_block_delta': _on_block_delta,
+}
+
+async def _aiter_data_lines(response):
+    """Yield the raw payload of each `data: ` line; the stream is never decoded to str"""
+    buf = bytearray()
+    async for chunk in response.aiter_bytes():
+        buf += chunk
+        start = 0
+        while (nl := buf.find(b'\n', start)) != -1:
+            if buf.startswith(b'data: ', start):
+                yield bytes(buf[start + 6:nl]).rstrip(b'\r')
+            start = nl + 1
+        # 처리한 줄들은 청크마다 한 번에 잘라냄
+        del buf[:start]
+    if buf.startswith(b'data: '):
+        yield bytes(buf[6:])
+
+# 모든 테스트가 모듈 단위 이벤트 루프 하나와 AsyncClient 하나를 공유
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+class AsyncClaudeToolTester:
+    def __init__(self, client, router_url="http://localhost:4000"):
+        self.client = client
         self.router_url = router_url
         self.base_model = "gpt-oss"
         self.max_tokens = 4000
+        self._skeletons = {}
         
-    def send_tool_request(self, tools, user_message, timeout=60):
-        """Send a tool request through the Claude Router"""
-        payload = {
-            "model": self.base_model,
-            "max_tokens": self.max_tokens,
-            "messages": [{"role": "user", "content": user_message}],
-            "tools": tools,
-            "stream": True
-        }
+    def _request_body(self, tool_names, user_message):
+        """Request JSON for these tools; only the user message is encoded per call"""
+        skeleton = self._skeletons.get(tool_names)
+        if skeleton is None:
+            # 메시지 자리에 sentinel을 넣어 한 번 직렬화해 두고 앞뒤 조각만 재사용
+            encoded = json_dumps({
+                "model": self.base_model,
+                "max_tokens": self.max_tokens,
+                "messages": [{"role": "user", "content": "__MSG__"}],
+                "tools": [TOOLS[name] for name in tool_names],
+                "stream": True
+            })
+            skeleton = self._skeletons[tool_names] = tuple(encoded.split(b'"__MSG__"'))
+        prefix, suffix = skeleton
+        return prefix + json_dumps(user_message) + suffix
         
+    async def send_tool_request(self, tool_names, user_message, timeout=60, capture_text=False):
+        """Send a tool request through the Claude Router
+
+        Text deltas are only collected into "content" when capture_text is set;
+        the tool tests only look at tool calls.
+        """
         try:
-            response = requests.post(
+            async with self.client.stream(
+                "POST",
                 f"{self.router_url}/v1/messages",
-                json=payload,
+                content=self._request_body(tuple(tool_names), user_message),
                 headers={"Content-Type": "application/json"},
-                stream=True,
                 timeout=timeout
-            )
-            
-            if response.status_code != 200:
-                return {"error": f"HTTP {response.status_code}: {response.text}"}
-            
-            # Collect streaming response
-            tool_calls = []
-            content_parts = []
-            
-            for line in response.iter_lines():
-                if line:
-                    line_str = line.decode('utf-8')
-                    if line_str.startswith('data: '):
-                        data_part = line_str[6:]
-                        if data_part.strip() == '[DONE]':
-                            break
-                        
-                        try:
-                            event_data = json.loads(data_part)
-                            
-                            if event_data.get('type') == 'content_block_start':
-                                block = event_data.get('content_block', {})
-                                if block.get('type') == 'tool_use':
-                                    tool_calls.append(block)
-                            
-                            elif event_data.get('type') == 'content_block_delta':
-                                delta = event_data.get('delta', {})
-                                if delta.get('type') == 'text_delta':
-                                    content_parts.append(delta.get('text', ''))
-                                    
-                        except json.JSONDecodeError:
-                            continue
+            ) as response:
+                
+                if response.status_code != 200:
+                    await response.aread()
+                    return {"error": f"HTTP {response.status_code}: {response.text}"}
+                
+                # Collect streaming response
+                tool_calls = []
+                content_parts = []
+                
+                async for data_part in _aiter_data_lines(response):
+                    if not _interesting(data_part, capture_text):
+                        continue
+                    
+                    try:
+                        event_data = json_loads(data_part)
+                        handler = _HANDLERS.get(event_data['type'])
+                        if handler is not None:
+                            handler(event_data, tool_calls, content_parts)
+                    except (ValueError, KeyError):
+                        # 잘못된 JSON이나 필드가 빠진 이벤트는 건너뜀
+                        continue
+                
+                for block in tool_calls:
+                    _finish_tool_call(block)
             
             return {
                 "success": True,
                 "tool_calls": tool_calls,
+                "tool_names": {tc.get("name") for tc in tool_calls},
                 "content": ''.join(content_parts),
                 "tool_count": len(tool_calls)
             }
@@ -77,13 +137,16 @@ class ClaudeToolTester:
         except Exception as e:
             return {"error": str(e)}
 
-# Initialize tester
-tester = ClaudeToolTester()
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def tester():
+    """Shared tester backed by one pooled httpx.AsyncClient"""
+    async with httpx.AsyncClient(timeout=60) as client:
+        yield AsyncClaudeToolTester(client)
 
-def test_router_health():
+async def test_router_health(tester):
     """Test that the Claude Router is running and healthy"""
     try:
-        response = requests.get(f"{tester.router_url}/health", timeout=5)
+        response = await tester.client.get(f"{tester.router_url}/health", timeout=5)
         assert response.status_code == 200
         health_data = response.json()
         assert health_data.get("status") == "ok"
@@ -92,446 +155,78 @@ def test_router_health():
     except Exception as e:
         pytest.fail(f"Router health check failed: {e}")
 
-def create_claude_tool_schema(name, description, properties, required=None):
-    """Helper to create Claude Code tool schema"""
-    return {
-        "name": name,
-        "description": description,
-        "input_schema": {
-            "type": "object",
-            "properties": properties,
-            "required": required or []
-        }
-    }
-
-# File Operations Tools Tests
-def test_write_tool():
-    """Test Write tool through router"""
-    tool = create_claude_tool_schema(
-        "Write",
-        "Writes a file to the local filesystem",
-        {
-            "file_path": {"type": "string"},
-            "content": {"type": "string"}
-        },
-        ["file_path", "content"]
-    )
-    
-    message = "Create a hello world file at /tmp/test_write.txt with the content 'Hello, World!'"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"Write tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "Write tool was not called"
-    
-    # Check if Write tool was called
-    write_calls = [tc for tc in result["tool_calls"] if tc.get("name") == "Write"]
-    assert len(write_calls) > 0, "Write tool was not invoked"
-    
-    print("✅ Write tool test passed")
-
-def test_read_tool():
-    """Test Read tool through router"""
-    tool = create_claude_tool_schema(
-        "Read",
-        "Reads a file from the local filesystem",
-        {
-            "file_path": {"type": "string"},
-            "limit": {"type": "number"},
-            "offset": {"type": "number"}
-        },
-        ["file_path"]
-    )
-    
-    message = "Read the contents of /etc/passwd file"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"Read tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "Read tool was not called"
-    
-    read_calls = [tc for tc in result["tool_calls"] if tc.get("name") == "Read"]
-    assert len(read_calls) > 0, "Read tool was not invoked"
-    
-    print("✅ Read tool test passed")
-
-def test_edit_tool():
-    """Test Edit tool through router"""
-    tool = create_claude_tool_schema(
-        "Edit",
-        "Performs exact string replacements in files",
-        {
-            "file_path": {"type": "string"},
-            "old_string": {"type": "string"},
-            "new_string": {"type": "string"},
-            "replace_all": {"type": "boolean"}
-        },
-        ["file_path", "old_string", "new_string"]
-    )
-    
-    message = "Edit /tmp/test.txt to replace 'old text' with 'new text'"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"Edit tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "Edit tool was not called"
-    
-    print("✅ Edit tool test passed")
-
-def test_multiedit_tool():
-    """Test MultiEdit tool through router"""
-    tool = create_claude_tool_schema(
-        "MultiEdit",
-        "Makes multiple edits to a single file in one operation",
-        {
-            "file_path": {"type": "string"},
-            "edits": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "old_string": {"type": "string"},
-                        "new_string": {"type": "string"},
-                        "replace_all": {"type": "boolean"}
-                    },
-                    "required": ["old_string", "new_string"]
-                }
-            }
-        },
-        ["file_path", "edits"]
-    )
-    
-    message = "Make multiple edits to a Python file: replace all 'print' with 'console.log' and 'def' with 'function'"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"MultiEdit tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "MultiEdit tool was not called"
-    
-    print("✅ MultiEdit tool test passed")
-
-# Execution Tools Tests
-def test_bash_tool():
-    """Test Bash tool through router"""
-    tool = create_claude_tool_schema(
-        "Bash",
-        "Executes a bash command in a persistent shell session",
-        {
-            "command": {"type": "string"},
-            "description": {"type": "string"},
-            "run_in_background": {"type": "boolean"},
-            "timeout": {"type": "number"}
-        },
-        ["command"]
-    )
-    
-    message = "Run the command 'echo Hello from bash' in the terminal"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"Bash tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "Bash tool was not called"
-    
-    print("✅ Bash tool test passed")
-
-def test_bashoutput_tool():
-    """Test BashOutput tool through router"""
-    tool = create_claude_tool_schema(
-        "BashOutput",
-        "Retrieves output from a running or completed background bash shell",
-        {
-            "bash_id": {"type": "string"},
-            "filter": {"type": "string"}
-        },
-        ["bash_id"]
-    )
-    
-    message = "Get output from background bash shell with ID 'test-shell-123'"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"BashOutput tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "BashOutput tool was not called"
-    
-    print("✅ BashOutput tool test passed")
-
-def test_killbash_tool():
-    """Test KillBash tool through router"""
-    tool = create_claude_tool_schema(
-        "KillBash",
-        "Kills a running background bash shell by its ID",
-        {
-            "shell_id": {"type": "string"}
-        },
-        ["shell_id"]
-    )
-    
-    message = "Kill the background bash shell with ID 'test-shell-456'"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"KillBash tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "KillBash tool was not called"
-    
-    print("✅ KillBash tool test passed")
-
-# Search Tools Tests  
-def test_glob_tool():
-    """Test Glob tool through router"""
-    tool = create_claude_tool_schema(
-        "Glob",
-        "Fast file pattern matching tool",
-        {
-            "pattern": {"type": "string"},
-            "path": {"type": "string"}
-        },
-        ["pattern"]
-    )
-    
-    message = "Find all Python files in the current directory using pattern '*.py'"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"Glob tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "Glob tool was not called"
-    
-    print("✅ Glob tool test passed")
-
-def test_grep_tool():
-    """Test Grep tool through router"""
-    tool = create_claude_tool_schema(
-        "Grep",
-        "A powerful search tool built on ripgrep",
-        {
-            "pattern": {"type": "string"},
-            "path": {"type": "string"},
-            "glob": {"type": "string"},
-            "type": {"type": "string"},
-            "output_mode": {"type": "string", "enum": ["content", "files_with_matches", "count"]},
-            "-i": {"type": "boolean"},
-            "-n": {"type": "boolean"},
-            "multiline": {"type": "boolean"},
-            "head_limit": {"type": "number"}
-        },
-        ["pattern"]
-    )
-    
-    message = "Search for the word 'function' in all JavaScript files"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"Grep tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "Grep tool was not called"
-    
-    print("✅ Grep tool test passed")
-
-# Web Tools Tests
-def test_webfetch_tool():
-    """Test WebFetch tool through router"""
-    tool = create_claude_tool_schema(
-        "WebFetch",
-        "Fetches content from a specified URL",
-        {
-            "url": {"type": "string", "format": "uri"},
-            "prompt": {"type": "string"}
-        },
-        ["url", "prompt"]
-    )
-    
-    message = "Fetch the homepage of example.com and summarize its content"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"WebFetch tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "WebFetch tool was not called"
-    
-    print("✅ WebFetch tool test passed")
-
-def test_websearch_tool():
-    """Test WebSearch tool through router"""
-    tool = create_claude_tool_schema(
-        "WebSearch",
-        "Search the web and use results to inform responses",
-        {
-            "query": {"type": "string"},
-            "allowed_domains": {"type": "array", "items": {"type": "string"}},
-            "blocked_domains": {"type": "array", "items": {"type": "string"}}
-        },
-        ["query"]
-    )
-    
-    message = "Search the web for 'Claude AI assistant latest features'"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"WebSearch tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "WebSearch tool was not called"
-    
-    print("✅ WebSearch tool test passed")
-
-# Notebook Tools Tests
-def test_notebookedit_tool():
-    """Test NotebookEdit tool through router"""
-    tool = create_claude_tool_schema(
-        "NotebookEdit",
-        "Replaces contents of a specific cell in a Jupyter notebook",
-        {
-            "notebook_path": {"type": "string"},
-            "new_source": {"type": "string"},
-            "cell_id": {"type": "string"},
-            "cell_type": {"type": "string", "enum": ["code", "markdown"]},
-            "edit_mode": {"type": "string", "enum": ["replace", "insert", "delete"]}
-        },
-        ["notebook_path", "new_source"]
-    )
-    
-    message = "Edit the first cell in notebook.ipynb to contain 'print(\"Hello Jupyter\")'"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"NotebookEdit tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "NotebookEdit tool was not called"
-    
-    print("✅ NotebookEdit tool test passed")
-
-def test_mcp_ide_executecode_tool():
-    """Test mcp__ide__executeCode tool through router"""
-    tool = create_claude_tool_schema(
-        "mcp__ide__executeCode",
-        "Execute python code in the Jupyter kernel",
-        {
-            "code": {"type": "string"}
-        },
-        ["code"]
-    )
-    
-    message = "Execute the Python code: print('Hello from Jupyter kernel')"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"mcp__ide__executeCode tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "mcp__ide__executeCode tool was not called"
-    
-    print("✅ mcp__ide__executeCode tool test passed")
-
-# Task Management Tools Tests
-def test_todowrite_tool():
-    """Test TodoWrite tool through router"""
-    tool = create_claude_tool_schema(
-        "TodoWrite",
-        "Create and manage a structured task list",
-        {
-            "todos": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "content": {"type": "string"},
-                        "status": {"type": "string", "enum": ["pending", "in_progress", "completed"]},
-                        "activeForm": {"type": "string"}
-                    },
-                    "required": ["content", "status", "activeForm"]
-                }
-            }
-        },
-        ["todos"]
-    )
-    
-    message = "Create a todo list for building a web application with authentication, database, and frontend"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"TodoWrite tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "TodoWrite tool was not called"
-    
-    print("✅ TodoWrite tool test passed")
-
-def test_task_tool():
-    """Test Task tool through router"""
-    tool = create_claude_tool_schema(
-        "Task",
-        "Launch a new agent to handle complex, multi-step tasks autonomously",
-        {
-            "description": {"type": "string"},
-            "prompt": {"type": "string"},
-            "subagent_type": {"type": "string"}
-        },
-        ["description", "prompt", "subagent_type"]
-    )
-    
-    message = "Launch a general-purpose agent to research Python web frameworks and create a comparison"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"Task tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "Task tool was not called"
-    
-    print("✅ Task tool test passed")
-
-def test_exitplanmode_tool():
-    """Test ExitPlanMode tool through router"""
-    tool = create_claude_tool_schema(
-        "ExitPlanMode",
-        "Exit plan mode and present plan for user approval",
-        {
-            "plan": {"type": "string"}
-        },
-        ["plan"]
-    )
-    
-    message = "I've finished planning the implementation. Present the plan: 1. Setup database 2. Create API 3. Build frontend"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"ExitPlanMode tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "ExitPlanMode tool was not called"
-    
-    print("✅ ExitPlanMode tool test passed")
-
-# IDE Integration Tools Tests
-def test_mcp_ide_getdiagnostics_tool():
-    """Test mcp__ide__getDiagnostics tool through router"""
-    tool = create_claude_tool_schema(
-        "mcp__ide__getDiagnostics",
-        "Get language diagnostics from VS Code",
-        {
-            "uri": {"type": "string"}
-        },
-        []
-    )
-    
-    message = "Get diagnostics for the current file to check for errors"
-    result = tester.send_tool_request([tool], message)
-    
-    assert not result.get("error"), f"mcp__ide__getDiagnostics tool failed: {result.get('error')}"
-    assert result.get("tool_count") > 0, "mcp__ide__getDiagnostics tool was not called"
-    
-    print("✅ mcp__ide__getDiagnostics tool test passed")
-
-# Comprehensive test runner
-def test_all_tools_comprehensive():
-    """Run all tool tests in sequence"""
-    print("\n🧪 Running comprehensive Claude Code tools test suite...")
-    
-    # Test categories
-    test_functions = [
-        test_router_health,
-        test_write_tool,
-        test_read_tool, 
-        test_edit_tool,
-        test_multiedit_tool,
-        test_bash_tool,
-        test_bashoutput_tool,
-        test_killbash_tool,
-        test_glob_tool,
-        test_grep_tool,
-        test_webfetch_tool,
-        test_websearch_tool,
-        test_notebookedit_tool,
-        test_mcp_ide_executecode_tool,
-        test_todowrite_tool,
-        test_task_tool,
-        test_exitplanmode_tool,
-        test_mcp_ide_getdiagnostics_tool
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test_func in test_functions:
-        try:
-            test_func()
-            passed += 1
-        except Exception as e:
-            print(f"❌ {test_func.__name__} failed: {e}")
-            failed += 1
-    
-    print(f"\n📊 Test Results: {passed} passed, {failed} failed")
-    assert failed == 0, f"{failed} tests failed"
+async def _assert_tool_called(tester, name, message):
+    """Send the registered schema for `name` and assert the router emitted that tool call"""
+    result = await tester.send_tool_request((name,), message)
+    
+    assert not result.get("error"), f"{name} tool failed: {result.get('error')}"
+    assert result.get("tool_count") > 0, f"{name} tool was not called"
+    assert name in result["tool_names"], f"{name} tool was not invoked"
+    
+    print(f"✅ {name} tool test passed")
+
+# (tool name, user message) per test; schemas come from the shared TOOLS registry
+TOOL_SPECS = [
+    # File Operations Tools Tests
+    ("Write", "Create a hello world file at /tmp/test_write.txt with the content 'Hello, World!'"),
+    ("Read", "Read the contents of /etc/passwd file"),
+    ("Edit", "Edit /tmp/test.txt to replace 'old text' with 'new text'"),
+    ("MultiEdit", "Make multiple edits to a Python file: replace all 'print' with 'console.log' and 'def' with 'function'"),
+    # Execution Tools Tests
+    ("Bash", "Run the command 'echo Hello from bash' in the terminal"),
+    ("BashOutput", "Get output from background bash shell with ID 'test-shell-123'"),
+    ("KillBash", "Kill the background bash shell with ID 'test-shell-456'"),
+    # Search Tools Tests
+    ("Glob", "Find all Python files in the current directory using pattern '*.py'"),
+    ("Grep", "Search for the word 'function' in all JavaScript files"),
+    # Web Tools Tests
+    ("WebFetch", "Fetch the homepage of example.com and summarize its content"),
+    ("WebSearch", "Search the web for 'Claude AI assistant latest features'"),
+    # Notebook Tools Tests
+    ("NotebookEdit", "Edit the first cell in notebook.ipynb to contain 'print(\"Hello Jupyter\")'"),
+    ("mcp__ide__executeCode", "Execute the Python code: print('Hello from Jupyter kernel')"),
+    # Task Management Tools Tests
+    ("TodoWrite", "Create a todo list for building a web application with authentication, database, and frontend"),
+    ("Task", "Launch a general-purpose agent to research Python web frameworks and create a comparison"),
+    ("ExitPlanMode", "I've finished planning the implementation. Present the plan: 1. Setup database 2. Create API 3. Build frontend"),
+    # IDE Integration Tools Tests
+    ("mcp__ide__getDiagnostics", "Get diagnostics for the current file to check for errors")
+]
+
+# 카테고리마다 하나씩은 기본으로 실행하고, 나머지 도구별 요청은 CLAUDE_ROUTER_SLOW=1일 때만 실행
+_RUN_SLOW = bool(os.environ.get("CLAUDE_ROUTER_SLOW"))
+_DEFAULT_TOOLS = {"Write", "Bash", "Grep", "WebFetch", "NotebookEdit", "TodoWrite"}
+_SLOW_MARKS = (
+    pytest.mark.slow,
+    pytest.mark.skipif(not _RUN_SLOW, reason="per-tool tests are slow; set CLAUDE_ROUTER_SLOW=1 to run them"),
+)
+
+async def test_all_tools_format_conversion(tester):
+    """Send every registered tool in one request and check each tool call that comes back
+
+    A 20B local model rarely calls all of them in one response, so the test does not
+    require every tool; it requires at least one call and that each call is well-formed.
+    """
+    names = [name for name, _ in TOOL_SPECS]
+    message = "Demonstrate a call to each of the following tools: " + ", ".join(names)
+    result = await tester.send_tool_request(names, message, timeout=120)
+    
+    assert not result.get("error"), f"Multi-tool request failed: {result.get('error')}"
+    assert result["tool_count"] > 0, "No tool was called"
+    for call in result["tool_calls"]:
+        assert call["name"] in names, f"Unrequested tool called: {call['name']}"
+        assert call["id"].startswith("toolu_"), f"{call['name']} has no converted tool_use id: {call['id']!r}"
+        assert isinstance(call["input"], dict), f"{call['name']} input is not an object: {call['input']!r}"
+    
+    print(f"✅ {result['tool_count']} tool calls converted in one request: {sorted(result['tool_names'])}")
+
+@pytest.mark.parametrize("name,message", [
+    pytest.param(name, message, id=name, marks=() if name in _DEFAULT_TOOLS else _SLOW_MARKS)
+    for name, message in TOOL_SPECS
+])
+async def test_tool(tester, name, message):
+    """Test that the router turns a request with this tool into a tool call"""
+    await _assert_tool_called(tester, name, message)
 
 if __name__ == "__main__":
-    test_all_tools_comprehensive()
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, "-v"]))
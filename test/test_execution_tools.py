@@ -3,13 +3,40 @@
 Execution Tools Test Suite
 Tests: Bash, BashOutput, KillBash
 """
+import atexit
+import functools
 import requests
-import json
-import time
+import pytest
+from requests.adapters import HTTPAdapter
+
+from json_codec import json_dumps, json_loads
+from tool_schemas import TOOLS
+
+# keep-alive 커넥션은 모듈 단위 Session으로 재사용
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+atexit.register(_SESSION.close)
+
+def _iter_data_lines(response, chunk_size=16384):
+    """Yield raw `data: ` payloads by scanning response chunks for newlines directly"""
+    buf = bytearray()
+    for chunk in response.raw.stream(chunk_size, decode_content=True):
+        buf += chunk
+        start = 0
+        while (nl := buf.find(b'\n', start)) != -1:
+            if buf.startswith(b'data: ', start):
+                yield bytes(buf[start + 6:nl]).rstrip(b'\r')
+            start = nl + 1
+        # 처리한 줄들은 청크마다 한 번에 잘라냄
+        del buf[:start]
+    # 스트림이 개행 없이 끝나면 마지막 data: 줄이 버퍼에 남는다
+    if buf.startswith(b'data: '):
+        yield bytes(buf[6:]).rstrip(b'\r')
 
 class ExecutionToolsTest:
-    def __init__(self, router_url="http://localhost:4000"):
+    def __init__(self, router_url="http://localhost:4000", session=_SESSION):
         self.router_url = router_url
+        self.session = session
         
     def send_request(self, tools, message):
         payload = {
@@ -20,46 +47,42 @@ class ExecutionToolsTest:
             "stream": True
         }
         
-        response = requests.post(
+        response = self.session.post(
             f"{self.router_url}/v1/messages",
-            json=payload,
+            data=json_dumps(payload),
             headers={"Content-Type": "application/json"},
             stream=True,
             timeout=30
         )
         
+        # 다 읽은 뒤(또는 예외 시) 커넥션을 세션 풀로 돌려보내도록 with 안에서 소비
         tool_calls = []
-        for line in response.iter_lines():
-            if line and line.decode('utf-8').startswith('data: '):
-                try:
-                    data = json.loads(line.decode('utf-8')[6:])
-                    if data.get('type') == 'content_block_start':
-                        block = data.get('content_block', {})
-                        if block.get('type') == 'tool_use':
-                            tool_calls.append(block)
-                except json.JSONDecodeError:
-                    continue
+        with response:
+            response.raise_for_status()
+            for data_part in _iter_data_lines(response):
+                # content_block_start 외의 프레임(대부분 delta)은 디코딩하지 않고 건너뜀
+                if b'"content_block_start"' in data_part:
+                    try:
+                        data = json_loads(data_part)
+                        if data.get('type') == 'content_block_start':
+                            block = data.get('content_block', {})
+                            if block.get('type') == 'tool_use':
+                                tool_calls.append(block)
+                    except ValueError:
+                        continue
                     
         return tool_calls
 
+@functools.cache
+def _tester(router_url="http://localhost:4000"):
+    """Per-process tester, built lazily on first use instead of once per test"""
+    return ExecutionToolsTest(router_url)
+
 def test_bash_command_execution():
     """Test Bash tool for command execution"""
-    tester = ExecutionToolsTest()
-    
-    bash_tool = {
-        "name": "Bash",
-        "description": "Executes a bash command in a persistent shell session",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "command": {"type": "string"},
-                "description": {"type": "string"},
-                "run_in_background": {"type": "boolean"},
-                "timeout": {"type": "number"}
-            },
-            "required": ["command"]
-        }
-    }
+    tester = _tester()
+    
+    bash_tool = TOOLS["Bash"]
     
     message = "Run the bash command 'echo \"Hello from bash execution test\"'"
     calls = tester.send_request([bash_tool], message)
@@ -75,22 +98,9 @@ def test_bash_command_execution():
 
 def test_bash_background_execution():
     """Test Bash tool for background command execution"""
-    tester = ExecutionToolsTest()
-    
-    bash_tool = {
-        "name": "Bash",
-        "description": "Executes a bash command in a persistent shell session",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "command": {"type": "string"},
-                "description": {"type": "string"},
-                "run_in_background": {"type": "boolean"},
-                "timeout": {"type": "number"}
-            },
-            "required": ["command"]
-        }
-    }
+    tester = _tester()
+    
+    bash_tool = TOOLS["Bash"]
     
     message = "Run 'sleep 10' in the background"
     calls = tester.send_request([bash_tool], message)
@@ -102,22 +112,9 @@ def test_bash_background_execution():
 
 def test_bash_with_timeout():
     """Test Bash tool with timeout parameter"""
-    tester = ExecutionToolsTest()
-    
-    bash_tool = {
-        "name": "Bash",
-        "description": "Executes a bash command in a persistent shell session",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "command": {"type": "string"},
-                "description": {"type": "string"},
-                "run_in_background": {"type": "boolean"},
-                "timeout": {"type": "number"}
-            },
-            "required": ["command"]
-        }
-    }
+    tester = _tester()
+    
+    bash_tool = TOOLS["Bash"]
     
     message = "Run 'ls -la' with a timeout of 5 seconds"
     calls = tester.send_request([bash_tool], message)
@@ -129,20 +126,9 @@ def test_bash_with_timeout():
 
 def test_bashoutput_retrieval():
     """Test BashOutput tool for retrieving command output"""
-    tester = ExecutionToolsTest()
-    
-    bashoutput_tool = {
-        "name": "BashOutput",
-        "description": "Retrieves output from a running or completed background bash shell",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "bash_id": {"type": "string"},
-                "filter": {"type": "string"}
-            },
-            "required": ["bash_id"]
-        }
-    }
+    tester = _tester()
+    
+    bashoutput_tool = TOOLS["BashOutput"]
     
     message = "Get the output from bash shell with ID 'test-shell-123'"
     calls = tester.send_request([bashoutput_tool], message)
@@ -158,20 +144,9 @@ def test_bashoutput_retrieval():
 
 def test_bashoutput_with_filter():
     """Test BashOutput tool with regex filter"""
-    tester = ExecutionToolsTest()
-    
-    bashoutput_tool = {
-        "name": "BashOutput",
-        "description": "Retrieves output from a running or completed background bash shell",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "bash_id": {"type": "string"},
-                "filter": {"type": "string"}
-            },
-            "required": ["bash_id"]
-        }
-    }
+    tester = _tester()
+    
+    bashoutput_tool = TOOLS["BashOutput"]
     
     message = "Get output from shell 'log-shell' filtering only lines containing 'ERROR'"
     calls = tester.send_request([bashoutput_tool], message)
@@ -183,19 +158,9 @@ def test_bashoutput_with_filter():
 
 def test_killbash_termination():
     """Test KillBash tool for terminating background shells"""
-    tester = ExecutionToolsTest()
-    
-    killbash_tool = {
-        "name": "KillBash",
-        "description": "Kills a running background bash shell by its ID",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "shell_id": {"type": "string"}
-            },
-            "required": ["shell_id"]
-        }
-    }
+    tester = _tester()
+    
+    killbash_tool = TOOLS["KillBash"]
     
     message = "Kill the background bash shell with ID 'long-running-task'"
     calls = tester.send_request([killbash_tool], message)
@@ -211,44 +176,9 @@ def test_killbash_termination():
 
 def test_execution_tools_workflow():
     """Test complete execution workflow: Bash -> BashOutput -> KillBash"""
-    tester = ExecutionToolsTest()
-    
-    all_tools = [
-        {
-            "name": "Bash",
-            "description": "Executes a bash command in a persistent shell session",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "command": {"type": "string"},
-                    "run_in_background": {"type": "boolean"}
-                },
-                "required": ["command"]
-            }
-        },
-        {
-            "name": "BashOutput",
-            "description": "Retrieves output from a running background bash shell",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "bash_id": {"type": "string"}
-                },
-                "required": ["bash_id"]
-            }
-        },
-        {
-            "name": "KillBash",
-            "description": "Kills a running background bash shell",
-            "input_schema": {
-                "type": "object",
-                "properties": {
-                    "shell_id": {"type": "string"}
-                },
-                "required": ["shell_id"]
-            }
-        }
-    ]
+    tester = _tester()
+    
+    all_tools = [TOOLS["Bash"], TOOLS["BashOutput"], TOOLS["KillBash"]]
     
     message = "Start a background process to monitor system logs, then check its output, and finally terminate it"
     calls = tester.send_request(all_tools, message)
@@ -264,19 +194,5 @@ def test_execution_tools_workflow():
     
     print(f"✅ Execution workflow test successful - Called: {list(called_tools)}")
 
-def test_execution_tools_comprehensive():
-    """Run all execution tools tests"""
-    print("🧪 Testing Execution Tools...")
-    
-    test_bash_command_execution()
-    test_bash_background_execution()
-    test_bash_with_timeout()
-    test_bashoutput_retrieval()
-    test_bashoutput_with_filter()
-    test_killbash_termination()
-    test_execution_tools_workflow()
-    
-    print("✅ All execution tools tests passed!")
-
 if __name__ == "__main__":
-    test_execution_tools_comprehensive()
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -3,83 +3,102 @@
 File Operations Tools Test Suite
 Tests: Write, Read, Edit, MultiEdit
 """
-import requests
-import json
+import httpx
+import pytest
+import pytest_asyncio
+import shutil
 import tempfile
 import os
 from pathlib import Path
 
+from json_codec import json_dumps, json_loads
+from tool_schemas import TOOLS
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 class FileOperationsTest:
-    def __init__(self, router_url="http://localhost:4000"):
+    def __init__(self, client, router_url="http://localhost:4000"):
+        self.client = client
         self.router_url = router_url
         self.test_dir = tempfile.mkdtemp()
         
-    def send_request(self, tools, message):
+    async def send_request(self, tools, message):
         payload = {
             "model": "gpt-oss",
             "max_tokens": 4000,
             "messages": [{"role": "user", "content": message}],
             "tools": tools,
-            "stream": True
+            "stream": False
         }
         
-        response = requests.post(
+        # 도구 호출 목록만 필요하므로 SSE 대신 단일 JSON 응답을 받아 한 번만 파싱
+        response = await self.client.post(
             f"{self.router_url}/v1/messages",
-            json=payload,
+            content=json_dumps(payload),
             headers={"Content-Type": "application/json"},
-            stream=True,
             timeout=30
         )
+        response.raise_for_status()
         
-        tool_calls = []
-        for line in response.iter_lines():
-            if line and line.decode('utf-8').startswith('data: '):
-                try:
-                    data = json.loads(line.decode('utf-8')[6:])
-                    if data.get('type') == 'content_block_start':
-                        block = data.get('content_block', {})
-                        if block.get('type') == 'tool_use':
-                            tool_calls.append(block)
-                except json.JSONDecodeError:
+        body = json_loads(response.content)
+        return [block for block in body.get("content", []) if block.get("type") == "tool_use"]
+
+    async def stream_request(self, tools, message):
+        """Same request over SSE (the path Claude Code uses); tool_use input is rebuilt from its input_json_delta"""
+        payload = {
+            "model": "gpt-oss",
+            "max_tokens": 4000,
+            "messages": [{"role": "user", "content": message}],
+            "tools": tools,
+            "stream": True
+        }
+        
+        # 블록 index → tool_use 블록 (input은 partial_json 조각을 이어 붙인 뒤 파싱)
+        blocks = {}
+        partial = {}
+        async with self.client.stream(
+            "POST",
+            f"{self.router_url}/v1/messages",
+            content=json_dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=30
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.startswith('data: '):
                     continue
-                    
-        return tool_calls
+                data = json_loads(line[6:])
+                if data.get('type') == 'content_block_start' and data['content_block'].get('type') == 'tool_use':
+                    blocks[data['index']] = data['content_block']
+                    partial[data['index']] = []
+                elif data.get('type') == 'content_block_delta' and data['index'] in partial:
+                    partial[data['index']].append(data['delta']['partial_json'])
+        
+        for index, block in blocks.items():
+            block['input'] = json_loads("".join(partial[index])) if partial[index] else {}
+        return list(blocks.values())
 
-def test_write_read_cycle():
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def tester():
+    """Shared tester backed by one pooled httpx.AsyncClient"""
+    async with httpx.AsyncClient(timeout=30) as client:
+        tester = FileOperationsTest(client)
+        try:
+            yield tester
+        finally:
+            # 모듈이 끝나면 테스트용 임시 디렉터리도 정리
+            shutil.rmtree(tester.test_dir, ignore_errors=True)
+
+async def test_write_read_cycle(tester):
     """Test Write then Read file operations"""
-    tester = FileOperationsTest()
     test_file = os.path.join(tester.test_dir, "test_write_read.txt")
     
-    # Write tool schema
-    write_tool = {
-        "name": "Write",
-        "description": "Writes a file to the local filesystem",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "file_path": {"type": "string"},
-                "content": {"type": "string"}
-            },
-            "required": ["file_path", "content"]
-        }
-    }
-    
-    # Read tool schema
-    read_tool = {
-        "name": "Read", 
-        "description": "Reads a file from the local filesystem",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "file_path": {"type": "string"}
-            },
-            "required": ["file_path"]
-        }
-    }
+    write_tool = TOOLS["Write"]
+    read_tool = TOOLS["Read"]
     
     # Test Write
     write_message = f"Write a file at {test_file} with content 'Hello File Operations Test!'"
-    write_calls = tester.send_request([write_tool], write_message)
+    write_calls = await tester.send_request([write_tool], write_message)
     
     assert len(write_calls) > 0, "Write tool not called"
     assert write_calls[0]["name"] == "Write", "Wrong tool called"
@@ -87,82 +106,45 @@ def test_write_read_cycle():
     
     # Test Read
     read_message = f"Read the contents of file {test_file}"
-    read_calls = tester.send_request([read_tool], read_message)
+    read_calls = await tester.send_request([read_tool], read_message)
     
     assert len(read_calls) > 0, "Read tool not called"
     assert read_calls[0]["name"] == "Read", "Wrong tool called"
     print("✅ Read tool call successful")
 
-def test_edit_operations():
+async def test_edit_operations(tester):
     """Test Edit tool for string replacement"""
-    tester = FileOperationsTest()
-    
-    edit_tool = {
-        "name": "Edit",
-        "description": "Performs exact string replacements in files",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "file_path": {"type": "string"},
-                "old_string": {"type": "string"},
-                "new_string": {"type": "string"},
-                "replace_all": {"type": "boolean"}
-            },
-            "required": ["file_path", "old_string", "new_string"]
-        }
-    }
+    edit_tool = TOOLS["Edit"]
     
     message = "Edit the file config.py to replace 'DEBUG = True' with 'DEBUG = False'"
-    calls = tester.send_request([edit_tool], message)
+    calls = await tester.send_request([edit_tool], message)
     
     assert len(calls) > 0, "Edit tool not called"
     assert calls[0]["name"] == "Edit", "Wrong tool called"
     print("✅ Edit tool call successful")
 
-def test_multiedit_operations():
+async def test_multiedit_operations(tester):
     """Test MultiEdit tool for multiple replacements"""
-    tester = FileOperationsTest()
-    
-    multiedit_tool = {
-        "name": "MultiEdit",
-        "description": "Makes multiple edits to a single file in one operation",
-        "input_schema": {
-            "type": "object",
-            "properties": {
-                "file_path": {"type": "string"},
-                "edits": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "old_string": {"type": "string"},
-                            "new_string": {"type": "string"},
-                            "replace_all": {"type": "boolean"}
-                        },
-                        "required": ["old_string", "new_string"]
-                    }
-                }
-            },
-            "required": ["file_path", "edits"]
-        }
-    }
+    multiedit_tool = TOOLS["MultiEdit"]
     
     message = "Make multiple edits to app.py: replace 'localhost' with '0.0.0.0' and 'port=5000' with 'port=8080'"
-    calls = tester.send_request([multiedit_tool], message)
+    calls = await tester.send_request([multiedit_tool], message)
     
     assert len(calls) > 0, "MultiEdit tool not called"
     assert calls[0]["name"] == "MultiEdit", "Wrong tool called"
     print("✅ MultiEdit tool call successful")
 
-def test_file_operations_comprehensive():
-    """Run all file operations tests"""
-    print("🧪 Testing File Operations Tools...")
-    
-    test_write_read_cycle()
-    test_edit_operations() 
-    test_multiedit_operations()
+async def test_write_over_sse(tester):
+    """Test Write over the SSE stream that Claude Code consumes"""
+    test_file = os.path.join(tester.test_dir, "test_sse_write.txt")
+    message = f"Write a file at {test_file} with content 'Hello SSE!'"
+    calls = await tester.stream_request([TOOLS["Write"]], message)
     
-    print("✅ All file operations tests passed!")
+    assert len(calls) > 0, "Write tool not called"
+    assert calls[0]["name"] == "Write", "Wrong tool called"
+    assert calls[0]["id"], "tool_use id missing"
+    assert "file_path" in calls[0]["input"], "file_path parameter missing"
+    print("✅ Write tool call over SSE successful")
 
 if __name__ == "__main__":
-    test_file_operations_comprehensive()
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Non-streaming Response Test Suite
+Tests the "stream": false Messages body against a canned Ollama reply (no router or Ollama needed)
+"""
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from json_codec import json_dumps, json_loads
+from tool_schemas import TOOLS
+
+# 라우터 앱을 프로세스 안에서 직접 호출하므로 저장소 루트를 import 경로에 추가
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src import main as router
+
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+class NonStreamingTest:
+    def __init__(self, client):
+        self.client = client
+        self.ollama_requests = []
+        self.ollama_reply = b""
+
+    def handle_ollama(self, request):
+        """Record the Ollama payload and answer with the canned reply"""
+        self.ollama_requests.append(json_loads(request.content))
+        return httpx.Response(200, content=self.ollama_reply, headers={"Content-Type": "application/json"})
+
+    async def send_request(self, ollama_reply, tools=None, message="hi"):
+        self.ollama_reply = ollama_reply if isinstance(ollama_reply, bytes) else json_dumps(ollama_reply)
+        payload = {
+            "model": "gpt-oss",
+            "max_tokens": 4000,
+            "messages": [{"role": "user", "content": message}],
+            "stream": False
+        }
+        if tools:
+            payload["tools"] = tools
+
+        return await self.client.post("/v1/messages", content=json_dumps(payload),
+                                      headers={"Content-Type": "application/json"})
+
+@pytest_asyncio.fixture(loop_scope="module")
+async def tester(monkeypatch):
+    """Router app over ASGI, with its Ollama client answered in-process"""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=router.app), base_url="http://router") as client:
+        tester = NonStreamingTest(client)
+        ollama_client = httpx.AsyncClient(transport=httpx.MockTransport(tester.handle_ollama))
+        monkeypatch.setattr(router, "_client", ollama_client)
+        try:
+            yield tester
+        finally:
+            await ollama_client.aclose()
+
+async def test_text_response_shape(tester):
+    """Plain text reply becomes one Messages body with end_turn"""
+    response = await tester.send_request({"message": {"content": "Hello from the router"}, "done": True})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    body = json_loads(response.content)
+    assert body["type"] == "message"
+    assert body["role"] == "assistant"
+    assert body["id"].startswith("msg_")
+    assert body["model"] == router.MODEL_NAME
+    assert body["content"] == [{"type": "text", "text": "Hello from the router"}]
+    assert body["stop_reason"] == "end_turn"
+    assert body["usage"]["output_tokens"] == 4
+
+    # Ollama도 비스트리밍으로 호출해야 한다
+    assert tester.ollama_requests[-1]["stream"] is False
+
+async def test_thinking_block_is_signed(tester):
+    """Thinking comes before text and carries a signature"""
+    response = await tester.send_request({"message": {"thinking": "Let me think", "content": "Done"}, "done": True})
+
+    body = json_loads(response.content)
+    assert [block["type"] for block in body["content"]] == ["thinking", "text"]
+    assert body["content"][0]["thinking"] == "Let me think"
+    assert body["content"][0]["signature"]
+
+async def test_tool_use_response_shape(tester):
+    """Only tool calls that convert become tool_use blocks and count toward usage"""
+    tool_calls = [
+        {"function": {"name": "Bash", "arguments": {"command": "ls"}}},
+        {"function": {"name": "Bash", "arguments": "not-a-dict"}},
+    ]
+    response = await tester.send_request({"message": {"content": "", "tool_calls": tool_calls}, "done": True},
+                                         tools=[TOOLS["Bash"]], message="List the files")
+
+    assert response.status_code == 200
+    body = json_loads(response.content)
+    assert body["stop_reason"] == "tool_use"
+    assert len(body["content"]) == 1
+
+    block = body["content"][0]
+    assert block["type"] == "tool_use"
+    assert block["id"]
+    assert block["name"] == "Bash"
+    assert block["input"] == {"command": "ls"}
+    assert body["usage"]["output_tokens"] == 10
+
+    # 요청한 도구는 Ollama 형식으로 변환되어 전달된다
+    sent_tools = tester.ollama_requests[-1]["tools"]
+    assert [tool["function"]["name"] for tool in sent_tools] == ["Bash"]
+
+async def test_undecodable_ollama_body_returns_error_envelope(tester):
+    """Truncated Ollama JSON becomes a 502 Anthropic error body"""
+    response = await tester.send_request(b'{"message": {"content": "hel')
+
+    assert response.status_code == 502
+    body = json_loads(response.content)
+    assert body["type"] == "error"
+    assert body["error"]["type"] == "error"
+    assert body["error"]["message"].startswith("Invalid response from Ollama")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v"]))
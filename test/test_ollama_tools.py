@@ -5,6 +5,8 @@ Test Ollama tool calling directly to see if gpt-oss:20b supports it
 import json
 import requests
 
+from json_codec import json_dumps
+
 def test_ollama_direct():
     url = "http://localhost:11434/api/chat"
     
@@ -38,7 +40,7 @@ def test_ollama_direct():
     print(f"📤 Model: {payload['model']}")
     
     try:
-        response = requests.post(url, json=payload, timeout=30)
+        response = requests.post(url, data=json_dumps(payload), headers={"Content-Type": "application/json"}, timeout=30)
         response.raise_for_status()
         
         result = response.json()
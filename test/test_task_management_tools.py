@@ -4,7 +4,9 @@ Task Management Tools Test Suite
 Tests: TodoWrite, Task, ExitPlanMode
 """
 import requests
-import json
+import pytest
+
+from json_codec import json_dumps, json_loads
 
 class TaskManagementToolsTest:
     def __init__(self, router_url="http://localhost:4000"):
@@ -21,7 +23,7 @@ class TaskManagementToolsTest:
         
         response = requests.post(
             f"{self.router_url}/v1/messages",
-            json=payload,
+            data=json_dumps(payload),
             headers={"Content-Type": "application/json"},
             stream=True,
             timeout=45  # Longer timeout for complex planning tasks
@@ -29,14 +31,15 @@ class TaskManagementToolsTest:
         
         tool_calls = []
         for line in response.iter_lines():
-            if line and line.decode('utf-8').startswith('data: '):
+            # tool_use는 content_block_start에만 실리므로 나머지 이벤트는 JSON 파싱 없이 건너뜀
+            if line.startswith(b'data: ') and b'"content_block_start"' in line:
                 try:
-                    data = json.loads(line.decode('utf-8')[6:])
+                    data = json_loads(line[6:])
                     if data.get('type') == 'content_block_start':
                         block = data.get('content_block', {})
                         if block.get('type') == 'tool_use':
                             tool_calls.append(block)
-                except json.JSONDecodeError:
+                except ValueError:  # json/orjson decode errors both subclass ValueError
                     continue
                     
         return tool_calls
@@ -382,22 +385,5 @@ def test_task_management_workflow():
     
     print(f"✅ Task management workflow test successful - Called: {list(called_tools)}")
 
-def test_task_management_tools_comprehensive():
-    """Run all task management tools tests"""
-    print("🧪 Testing Task Management Tools...")
-    
-    test_todowrite_basic_planning()
-    test_todowrite_complex_project()
-    test_todowrite_task_status_management()
-    test_task_agent_general()
-    test_task_agent_statusline()
-    test_task_agent_output_style()
-    test_task_complex_research()
-    test_exitplanmode_basic()
-    test_exitplanmode_detailed_plan()
-    test_task_management_workflow()
-    
-    print("✅ All task management tools tests passed!")
-
 if __name__ == "__main__":
-    test_task_management_tools_comprehensive()
\ No newline at end of file
+    raise SystemExit(pytest.main([__file__, "-v"]))
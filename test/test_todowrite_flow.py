@@ -4,9 +4,12 @@ Test TodoWrite tool flow through Claude Router
 Tests the complete flow: Claude Code -> Router -> Ollama -> Router -> Claude Code
 """
 import requests
-import json
 import time
 
+from json_codec import json_dumps, json_loads
+
+_DATA_PREFIX = b'data: '
+
 def test_todowrite_through_router():
     """Test TodoWrite tool calling through the Claude Router"""
     
@@ -55,7 +58,7 @@ def test_todowrite_through_router():
     try:
         response = requests.post(
             "http://localhost:4000/v1/messages",
-            json=test_message,
+            data=json_dumps(test_message),
             headers={"Content-Type": "application/json"},
             stream=True,
             timeout=60
@@ -72,15 +75,15 @@ def test_todowrite_through_router():
         content_parts = []
         
         for line in response.iter_lines():
+            # 줄을 str로 디코드하지 않고 bytes 그대로 접두사를 비교해 JSON 파서에 넘김
             if line:
-                line_str = line.decode('utf-8')
-                if line_str.startswith('data: '):
-                    data_part = line_str[6:]  # Remove 'data: '
-                    if data_part.strip() == '[DONE]':
+                if line[:6] == _DATA_PREFIX:
+                    data_part = line[6:]  # Remove 'data: '
+                    if data_part.strip() == b'[DONE]':
                         break
                         
                     try:
-                        event_data = json.loads(data_part)
+                        event_data = json_loads(data_part)
                         
                         # Check for tool calls
                         if event_data.get('type') == 'content_block_start':
@@ -100,7 +103,7 @@ def test_todowrite_through_router():
                             partial_json = event_data.get('delta', {}).get('partial_json', '')
                             print(f"🔧 Tool Input Stream: {partial_json[:100]}...")
                             
-                    except json.JSONDecodeError:
+                    except ValueError:  # json/orjson decode errors both subclass ValueError
                         continue
         
         print(f"\n📊 Test Results:")
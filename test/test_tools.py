@@ -5,6 +5,8 @@ Test script to directly test Ollama's tool calling with our router
 import json
 import requests
 
+from json_codec import json_dumps
+
 def test_tool_calling():
     url = "http://localhost:4000/v1/messages"
     
@@ -42,7 +44,7 @@ def test_tool_calling():
     print(f"📤 Sending request: {json.dumps(payload, indent=2)}")
     
     try:
-        response = requests.post(url, json=payload, stream=True, timeout=30)
+        response = requests.post(url, data=json_dumps(payload), headers={"Content-Type": "application/json"}, stream=True, timeout=30)
         response.raise_for_status()
         
         print("📥 Response:")
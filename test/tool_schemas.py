@@ -0,0 +1,221 @@
+"""
+Shared Claude Code tool schemas for the router test suites
+Built once at import time; tests look schemas up by tool name
+"""
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+@dataclass(slots=True, frozen=True)
+class ToolSchema:
+    name: str
+    description: str
+    properties: dict
+    required: tuple = ()
+    # 요청 본문에 그대로 들어가는 dict; JSON 인코더가 바로 받도록 일반 dict로 한 번만 만든다
+    payload: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "payload", {
+            "name": self.name,
+            "description": self.description,
+            "input_schema": {
+                "type": "object",
+                "properties": self.properties,
+                "required": list(self.required)
+            }
+        })
+
+def create_claude_tool_schema(name, description, properties, required=None):
+    """Helper to create Claude Code tool schema"""
+    return ToolSchema(name, description, properties, tuple(required or ()))
+
+# 테스트 간에 공유되므로 읽기 전용 뷰로 노출
+TOOLS = MappingProxyType({schema.name: schema.payload for schema in (
+    create_claude_tool_schema(
+        "Write",
+        "Writes a file to the local filesystem",
+        {
+            "file_path": {"type": "string"},
+            "content": {"type": "string"}
+        },
+        ["file_path", "content"]
+    ),
+    create_claude_tool_schema(
+        "Read",
+        "Reads a file from the local filesystem",
+        {
+            "file_path": {"type": "string"},
+            "limit": {"type": "number"},
+            "offset": {"type": "number"}
+        },
+        ["file_path"]
+    ),
+    create_claude_tool_schema(
+        "Edit",
+        "Performs exact string replacements in files",
+        {
+            "file_path": {"type": "string"},
+            "old_string": {"type": "string"},
+            "new_string": {"type": "string"},
+            "replace_all": {"type": "boolean"}
+        },
+        ["file_path", "old_string", "new_string"]
+    ),
+    create_claude_tool_schema(
+        "MultiEdit",
+        "Makes multiple edits to a single file in one operation",
+        {
+            "file_path": {"type": "string"},
+            "edits": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "old_string": {"type": "string"},
+                        "new_string": {"type": "string"},
+                        "replace_all": {"type": "boolean"}
+                    },
+                    "required": ["old_string", "new_string"]
+                }
+            }
+        },
+        ["file_path", "edits"]
+    ),
+    create_claude_tool_schema(
+        "Bash",
+        "Executes a bash command in a persistent shell session",
+        {
+            "command": {"type": "string"},
+            "description": {"type": "string"},
+            "run_in_background": {"type": "boolean"},
+            "timeout": {"type": "number"}
+        },
+        ["command"]
+    ),
+    create_claude_tool_schema(
+        "BashOutput",
+        "Retrieves output from a running or completed background bash shell",
+        {
+            "bash_id": {"type": "string"},
+            "filter": {"type": "string"}
+        },
+        ["bash_id"]
+    ),
+    create_claude_tool_schema(
+        "KillBash",
+        "Kills a running background bash shell by its ID",
+        {
+            "shell_id": {"type": "string"}
+        },
+        ["shell_id"]
+    ),
+    create_claude_tool_schema(
+        "Glob",
+        "Fast file pattern matching tool",
+        {
+            "pattern": {"type": "string"},
+            "path": {"type": "string"}
+        },
+        ["pattern"]
+    ),
+    create_claude_tool_schema(
+        "Grep",
+        "A powerful search tool built on ripgrep",
+        {
+            "pattern": {"type": "string"},
+            "path": {"type": "string"},
+            "glob": {"type": "string"},
+            "type": {"type": "string"},
+            "output_mode": {"type": "string", "enum": ["content", "files_with_matches", "count"]},
+            "-i": {"type": "boolean"},
+            "-n": {"type": "boolean"},
+            "multiline": {"type": "boolean"},
+            "head_limit": {"type": "number"}
+        },
+        ["pattern"]
+    ),
+    create_claude_tool_schema(
+        "WebFetch",
+        "Fetches content from a specified URL",
+        {
+            "url": {"type": "string", "format": "uri"},
+            "prompt": {"type": "string"}
+        },
+        ["url", "prompt"]
+    ),
+    create_claude_tool_schema(
+        "WebSearch",
+        "Search the web and use results to inform responses",
+        {
+            "query": {"type": "string"},
+            "allowed_domains": {"type": "array", "items": {"type": "string"}},
+            "blocked_domains": {"type": "array", "items": {"type": "string"}}
+        },
+        ["query"]
+    ),
+    create_claude_tool_schema(
+        "NotebookEdit",
+        "Replaces contents of a specific cell in a Jupyter notebook",
+        {
+            "notebook_path": {"type": "string"},
+            "new_source": {"type": "string"},
+            "cell_id": {"type": "string"},
+            "cell_type": {"type": "string", "enum": ["code", "markdown"]},
+            "edit_mode": {"type": "string", "enum": ["replace", "insert", "delete"]}
+        },
+        ["notebook_path", "new_source"]
+    ),
+    create_claude_tool_schema(
+        "mcp__ide__executeCode",
+        "Execute python code in the Jupyter kernel",
+        {
+            "code": {"type": "string"}
+        },
+        ["code"]
+    ),
+    create_claude_tool_schema(
+        "TodoWrite",
+        "Create and manage a structured task list",
+        {
+            "todos": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "content": {"type": "string"},
+                        "status": {"type": "string", "enum": ["pending", "in_progress", "completed"]},
+                        "activeForm": {"type": "string"}
+                    },
+                    "required": ["content", "status", "activeForm"]
+                }
+            }
+        },
+        ["todos"]
+    ),
+    create_claude_tool_schema(
+        "Task",
+        "Launch a new agent to handle complex, multi-step tasks autonomously",
+        {
+            "description": {"type": "string"},
+            "prompt": {"type": "string"},
+            "subagent_type": {"type": "string"}
+        },
+        ["description", "prompt", "subagent_type"]
+    ),
+    create_claude_tool_schema(
+        "ExitPlanMode",
+        "Exit plan mode and present plan for user approval",
+        {
+            "plan": {"type": "string"}
+        },
+        ["plan"]
+    ),
+    create_claude_tool_schema(
+        "mcp__ide__getDiagnostics",
+        "Get language diagnostics from VS Code",
+        {
+            "uri": {"type": "string"}
+        },
+        []
+    )
+)})